@@ -16,8 +16,13 @@ from openpyxl import Workbook, load_workbook
 
 from admin_panel.forms.import_forms import ClientImportForm
 from accounts.models import AccountRequest, ClientCategory, ClientCompany, ClientPayment, ClientProfile, ClientTransaction
-from catalog.models import Category, CategoryProductOrder, ClampMeasureRequest, Product, Supplier
-from catalog.services.clamp_quoter import calculate_clamp_quote
+from catalog.models import Category, CategoryProductOrder, ClampMeasureRequest, ClampSpecs, Product, Supplier
+from catalog.services.clamp_quoter import calculate_clamp_quote, parse_decimal_value, parse_int_value
+from catalog.services.clamp_request_products import (
+    get_or_create_request_product,
+    publish_clamp_request_product,
+    publish_clamp_request_products_bulk,
+)
 from core.models import (
     AdminAuditLog,
     AdminCompanyAccess,
@@ -2530,6 +2535,24 @@ class ClampQuoterTests(AdminPanelTestCase):
         self.assertEqual(row_map['lista_1']['final_price'], Decimal('872.07'))
         self.assertEqual(row_map['facturacion']['final_price'], Decimal('1245.82'))
 
+    def test_clamp_quote_can_skip_code_metadata(self):
+        payload = {
+            'dollar_rate': '1000',
+            'steel_price_usd': '1',
+            'clamp_type': 'trefilada',
+            'diameter': '1/2',
+            'width_mm': '100',
+            'length_mm': '200',
+            'profile_type': 'SEMICURVA',
+        }
+        full = calculate_clamp_quote(payload)
+        lean = calculate_clamp_quote({**payload, 'include_code_metadata': 'false'})
+
+        self.assertEqual(full['generated_code_metadata']['codigo'], full['generated_code'])
+        self.assertIsNone(lean['generated_code_metadata'])
+        self.assertEqual(lean['generated_code'], full['generated_code'])
+        self.assertEqual(lean['price_rows'], full['price_rows'])
+
     def test_laminada_allows_only_configured_diameters(self):
         with self.assertRaises(ValueError):
             calculate_clamp_quote({
@@ -2546,6 +2569,28 @@ class ClampQuoterTests(AdminPanelTestCase):
                 'profile_type': 'PLANA',
             })
 
+    def test_clamp_int_fields_report_non_numeric_values(self):
+        self.assertEqual(parse_int_value(' 85 ', 'Ancho (mm)', min_value=1), 85)
+        for raw, message in (
+            ('', 'Ancho (mm) es obligatorio.'),
+            ('8,5', 'Ancho (mm) debe ser numerico.'),
+            ('²', 'Ancho (mm) debe ser numerico.'),
+            ('1_000', 'Ancho (mm) debe ser numerico.'),
+            ('+5', 'Ancho (mm) debe ser numerico.'),
+            ('-5', 'Ancho (mm) debe ser numerico.'),
+            ('８５', 'Ancho (mm) debe ser numerico.'),
+            ('0', 'Ancho (mm) no puede ser menor a 1.'),
+        ):
+            with self.subTest(raw=raw), self.assertRaisesMessage(ValueError, message):
+                parse_int_value(raw, 'Ancho (mm)', min_value=1)
+
+    def test_clamp_decimal_fields_accept_numeric_values(self):
+        self.assertEqual(parse_decimal_value(Decimal('1050.50'), 'Dolar'), Decimal('1050.50'))
+        self.assertEqual(parse_decimal_value(23, 'Aumento'), Decimal('23'))
+        self.assertEqual(parse_decimal_value(' 1050,5 ', 'Dolar'), Decimal('1050.5'))
+        with self.assertRaisesMessage(ValueError, 'Dolar no puede ser menor a 0.'):
+            parse_decimal_value(Decimal('-1'), 'Dolar')
+
     def test_staff_can_save_clamp_quote(self):
         self.client.force_login(self.staff)
         response = self.client.post(
@@ -2942,6 +2987,161 @@ class OrderClampPublishTests(AdminPanelTestCase):
         self.product.refresh_from_db()
         self.assertEqual(self.product.price, Decimal('2278.54'))
 
+    def test_publish_falls_back_to_stored_price_when_quote_is_invalid(self):
+        self.clamp_request.diameter = '9/9'
+        self.clamp_request.save(update_fields=['diameter'])
+
+        product, _created, _published_now = publish_clamp_request_product(self.clamp_request)
+
+        self.assertEqual(product.price, Decimal('1500.00'))
+        self.assertEqual(product.cost, Decimal('1000.00'))
+
+    def test_republish_keeps_single_abrazaderas_link(self):
+        product, _created, published_now = publish_clamp_request_product(self.clamp_request)
+        self.assertTrue(published_now)
+
+        product, _created, published_now = publish_clamp_request_product(self.clamp_request)
+        self.assertFalse(published_now)
+        self.assertEqual(
+            list(product.categories.values_list('name', flat=True)),
+            ['ABRAZADERAS'],
+        )
+
+    def test_linked_product_specs_are_synced_from_joined_row(self):
+        ClampSpecs.objects.create(product=self.product, fabrication='TREFILADA', diameter='3/4', width=70, length=220)
+
+        product, created = get_or_create_request_product(self.clamp_request)
+
+        self.assertFalse(created)
+        self.assertEqual(product.pk, self.product.pk)
+        specs = ClampSpecs.objects.get(product=self.product)
+        self.assertEqual((specs.width, specs.shape, specs.manual_override), (81, 'SEMICURVA', True))
+        self.assertEqual(ClampSpecs.objects.filter(product=self.product).count(), 1)
+
+    def test_request_links_visible_product_with_same_specs(self):
+        category = Category.objects.create(name='ABRAZADERAS', is_active=True)
+        catalog_product = Product.objects.create(
+            sku='CAT-ABT-81',
+            name='ABRAZADERA TREFILADA DE 3/4 X 81 X 220 SEMICURVA',
+            price=Decimal('1500.00'),
+            category=category,
+        )
+        catalog_product.categories.add(category)
+        ClampSpecs.objects.create(
+            product=catalog_product,
+            fabrication='TREFILADA',
+            diameter='3/4',
+            width=81,
+            length=220,
+            shape='SEMICURVA',
+        )
+        self.clamp_request.linked_product = None
+        self.clamp_request.save(update_fields=['linked_product'])
+
+        product, created = get_or_create_request_product(self.clamp_request)
+
+        self.assertFalse(created)
+        self.assertEqual(product.pk, catalog_product.pk)
+        self.assertTrue(self.clamp_request.exists_in_catalog)
+        self.clamp_request.refresh_from_db()
+        self.assertEqual(self.clamp_request.linked_product_id, catalog_product.pk)
+        self.assertTrue(self.clamp_request.exists_in_catalog)
+        self.assertIsNotNone(self.clamp_request.published_to_catalog_at)
+
+    def test_bulk_publish_publishes_every_request(self):
+        second_product = Product.objects.create(
+            sku='ABL3470180P',
+            name='ABRAZADERA LAMINADA DE 3/4 X 70 X 180 PLANA',
+            price=Decimal('900.00'),
+            is_active=False,
+            attributes={'source': 'clamp_request', 'clamp_request_id': 0},
+        )
+        second_request = ClampMeasureRequest.objects.create(
+            client_user=self.client_user,
+            client_name='Cliente Publish Clamp',
+            clamp_type='laminada',
+            is_zincated=False,
+            diameter='3/4',
+            width_mm=70,
+            length_mm=180,
+            profile_type='PLANA',
+            quantity=1,
+            description='ABRAZADERA LAMINADA DE 3/4 X 70 X 180 PLANA',
+            generated_code='ABL3470180P',
+            linked_product=second_product,
+            dollar_rate=Decimal('1300.00'),
+            steel_price_usd=Decimal('1450.00'),
+            supplier_discount_pct=Decimal('0.00'),
+            general_increase_pct=Decimal('40.00'),
+            base_cost=Decimal('600.00'),
+            selected_price_list='lista_1',
+            estimated_final_price=Decimal('840.00'),
+            status=ClampMeasureRequest.STATUS_COMPLETED,
+        )
+
+        results = publish_clamp_request_products_bulk(
+            ClampMeasureRequest.objects.filter(pk__in=[self.clamp_request.pk, second_request.pk]).order_by('pk')
+        )
+
+        self.assertEqual([product.pk for product, _created, _published in results], [self.product.pk, second_product.pk])
+        self.assertTrue(all(published_now for _product, _created, published_now in results))
+        second_request.refresh_from_db()
+        self.assertIsNotNone(second_request.published_to_catalog_at)
+        self.assertTrue(second_request.exists_in_catalog)
+        self.assertTrue(second_product.categories.filter(name='ABRAZADERAS').exists())
+
+        again = publish_clamp_request_products_bulk([self.clamp_request, second_request])
+        self.assertFalse(any(published_now for _product, _created, published_now in again))
+
+    def test_clamp_request_list_offers_bulk_publish_for_completed_requests(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('admin_clamp_request_list'), {'status': 'completed'})
+
+        self.assertContains(response, reverse('admin_clamp_request_bulk_publish'))
+        self.assertContains(response, f'name="request_ids" value="{self.clamp_request.pk}"')
+
+    def test_staff_can_bulk_publish_selected_completed_requests(self):
+        pending_request = ClampMeasureRequest.objects.create(
+            client_user=self.client_user,
+            client_name='Cliente Publish Clamp',
+            clamp_type='trefilada',
+            diameter='3/4',
+            width_mm=90,
+            length_mm=240,
+            profile_type='CURVA',
+            quantity=1,
+            dollar_rate=Decimal('1300.00'),
+            steel_price_usd=Decimal('1450.00'),
+            supplier_discount_pct=Decimal('0.00'),
+            general_increase_pct=Decimal('40.00'),
+            base_cost=Decimal('700.00'),
+            selected_price_list='lista_1',
+            estimated_final_price=Decimal('980.00'),
+            status=ClampMeasureRequest.STATUS_PENDING,
+        )
+        self.client.force_login(self.staff)
+
+        response = self.client.post(
+            reverse('admin_clamp_request_bulk_publish'),
+            {'request_ids': [self.clamp_request.pk, pending_request.pk], 'status': 'completed'},
+        )
+
+        self.assertRedirects(
+            response,
+            f"{reverse('admin_clamp_request_list')}?status=completed",
+            fetch_redirect_response=False,
+        )
+        self.product.refresh_from_db()
+        self.clamp_request.refresh_from_db()
+        pending_request.refresh_from_db()
+        self.assertTrue(self.product.is_active)
+        self.assertTrue(self.product.categories.filter(name='ABRAZADERAS').exists())
+        self.assertIsNotNone(self.clamp_request.published_to_catalog_at)
+        self.assertIsNone(pending_request.linked_product_id)
+        log = AdminAuditLog.objects.get(action='clamp_request_bulk_publish')
+        self.assertEqual(log.details['clamp_request_ids'], [self.clamp_request.pk])
+        self.assertEqual(log.details['skipped'], 1)
+
 
 class OrderDeleteTests(AdminPanelTestCase):
     def setUp(self):
@@ -37,6 +37,7 @@ urlpatterns = [
     path('proveedores/<int:supplier_id>/exportar/', views.supplier_export, name='admin_supplier_export'),
     path('proveedores/<int:supplier_id>/imprimir/', views.supplier_print, name='admin_supplier_print'),
     path('abrazaderas-a-medida/', views.clamp_request_list, name='admin_clamp_request_list'),
+    path('abrazaderas-a-medida/publicar/', views.clamp_request_bulk_publish, name='admin_clamp_request_bulk_publish'),
     path('abrazaderas-a-medida/<int:pk>/', views.clamp_request_detail, name='admin_clamp_request_detail'),
     
     # Clients
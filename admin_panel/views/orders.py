@@ -180,6 +180,7 @@ from catalog.services.clamp_quoter import (
 )
 from catalog.services.clamp_request_products import (
     publish_clamp_request_product,
+    publish_clamp_request_products_bulk,
 )
 from catalog.services.category_assignment import (
     normalize_category_ids,
@@ -1371,6 +1372,60 @@ def clamp_request_list(request):
     )
 
 
+@staff_member_required
+@require_POST
+def clamp_request_bulk_publish(request):
+    """Publish the selected completed clamp requests into the catalog at once."""
+    redirect_url = reverse("admin_clamp_request_list")
+    params = {
+        key: str(request.POST.get(key, "")).strip()
+        for key in ("status", "q", "page")
+        if str(request.POST.get(key, "")).strip()
+    }
+    if params:
+        redirect_url = f"{redirect_url}?{urlencode(params)}"
+
+    selected_ids = normalize_category_ids(request.POST.getlist("request_ids"))
+    if not selected_ids:
+        messages.warning(request, "No se seleccionaron solicitudes.")
+        return redirect(redirect_url)
+
+    clamp_requests = list(
+        ClampMeasureRequest.objects.filter(
+            pk__in=selected_ids,
+            status=ClampMeasureRequest.STATUS_COMPLETED,
+        ).order_by("pk")
+    )
+    skipped = len(selected_ids) - len(clamp_requests)
+    if not clamp_requests:
+        messages.error(request, "Solo se pueden publicar solicitudes Completadas.")
+        return redirect(redirect_url)
+
+    results = publish_clamp_request_products_bulk(clamp_requests)
+
+    published_count = sum(1 for _product, _created, published_now in results if published_now)
+    log_admin_action(
+        request,
+        action="clamp_request_bulk_publish",
+        target_type="clamp_measure_request",
+        details={
+            "clamp_request_ids": [clamp_request.pk for clamp_request in clamp_requests],
+            "product_ids": [product.pk for product, _created, _published_now in results],
+            "created_products": sum(1 for _product, created, _published_now in results if created),
+            "published_now": published_count,
+            "skipped": skipped,
+        },
+    )
+
+    messages.success(
+        request,
+        f"{len(results)} solicitud(es) vinculadas al catalogo; {published_count} publicadas ahora.",
+    )
+    if skipped:
+        messages.warning(request, f"{skipped} solicitud(es) omitidas: deben estar Completadas.")
+    return redirect(redirect_url)
+
+
 @staff_member_required
 def clamp_request_detail(request, pk):
     """Detail and workflow actions for one custom clamp request."""
@@ -4118,4 +4173,4 @@ def order_delete(request, pk):
         'reason_name': 'cancel_reason',
     })
 
-__all__ = ['_get_order_active_invoice', '_parse_order_item_manual_price', '_build_order_detail_items', '_parse_payment_amount', '_parse_adjustment_amount', '_parse_paid_at', 'payment_list', 'payment_export_saas', '_build_clamp_quote_download_response', 'clamp_quoter', 'clamp_quote_close', 'clamp_quote_download', '_find_admin_clamp_request_matches', 'clamp_request_list', 'clamp_request_detail', '_get_order_request_admin_queryset', '_get_order_request_for_admin', '_parse_order_request_money', '_parse_order_request_quantity', '_get_order_request_proposal_source_rows', '_get_order_request_quote_document_types', '_get_order_request_invoice_document_types', '_count_legacy_client_account_documents_for_order', '_clear_legacy_client_account_documents_for_order', '_get_order_request_delete_blockers', '_get_internal_document_delete_blockers', '_get_order_hard_delete_blockers', '_ensure_request_operational_order', '_build_order_request_proposal_payloads', 'sales_workspace', 'order_request_list', 'order_request_detail', 'order_request_confirm_view', 'order_request_reject_view', 'order_request_propose_view', 'order_request_convert_view', 'order_request_generate_quote_view', 'order_request_generate_invoice_view', 'order_request_delete_view', 'order_list', 'order_create_from_panel', 'order_export_saas', 'order_detail', 'order_invoice_open', 'order_internal_document_create', 'order_fiscal_create_local', 'order_fiscal_register_external', 'order_item_add', 'order_item_edit', 'order_item_delete', 'order_hard_delete', 'internal_document_print', 'internal_document_delete', 'order_item_publish_clamp', 'order_delete']
+__all__ = ['_get_order_active_invoice', '_parse_order_item_manual_price', '_build_order_detail_items', '_parse_payment_amount', '_parse_adjustment_amount', '_parse_paid_at', 'payment_list', 'payment_export_saas', '_build_clamp_quote_download_response', 'clamp_quoter', 'clamp_quote_close', 'clamp_quote_download', '_find_admin_clamp_request_matches', 'clamp_request_list', 'clamp_request_bulk_publish', 'clamp_request_detail', '_get_order_request_admin_queryset', '_get_order_request_for_admin', '_parse_order_request_money', '_parse_order_request_quantity', '_get_order_request_proposal_source_rows', '_get_order_request_quote_document_types', '_get_order_request_invoice_document_types', '_count_legacy_client_account_documents_for_order', '_clear_legacy_client_account_documents_for_order', '_get_order_request_delete_blockers', '_get_internal_document_delete_blockers', '_get_order_hard_delete_blockers', '_ensure_request_operational_order', '_build_order_request_proposal_payloads', 'sales_workspace', 'order_request_list', 'order_request_detail', 'order_request_confirm_view', 'order_request_reject_view', 'order_request_propose_view', 'order_request_convert_view', 'order_request_generate_quote_view', 'order_request_generate_invoice_view', 'order_request_delete_view', 'order_list', 'order_create_from_panel', 'order_export_saas', 'order_detail', 'order_invoice_open', 'order_internal_document_create', 'order_fiscal_create_local', 'order_fiscal_register_external', 'order_item_add', 'order_item_edit', 'order_item_delete', 'order_hard_delete', 'internal_document_print', 'internal_document_delete', 'order_item_publish_clamp', 'order_delete']
@@ -0,0 +1,5 @@
+from catalog.services.clamp_extensions import load_compiled_clamp_modules
+
+# Antes de cualquier import de los parsers: solo con WEBFLEXS_CYTHON activo
+# y extensiones vigentes en build/clamp_ext/.
+load_compiled_clamp_modules()
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0031_brandcatalogbatch_reversible_removals'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clampspecs',
+            index=models.Index(fields=['fabrication', 'diameter', 'width', 'length', 'shape'], name='clampspecs_measure_lookup_idx'),
+        ),
+    ]
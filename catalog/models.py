@@ -1340,6 +1340,11 @@ class ClampSpecs(models.Model):
             models.Index(fields=["width"]),
             models.Index(fields=["length"]),
             models.Index(fields=["shape"]),
+            # Exact-measure lookup used to reuse products for clamp requests.
+            models.Index(
+                fields=["fabrication", "diameter", "width", "length", "shape"],
+                name="clampspecs_measure_lookup_idx",
+            ),
         ]
 
     def __str__(self):
@@ -1,4 +1,5 @@
-from catalog.services.clamp_parser import ClampParser
+import pandas as pd
+
 from catalog.services.import_utils import normalize_header, normalize_sku
 from catalog.services.product_importer import ProductImporter
 from core.services.importer import ImportRowResult
@@ -24,6 +25,50 @@ class AbrazaderaImporter(ProductImporter):
         "cod": "sku",
     }
 
+    CLAMP_TEXT_COLUMNS = ("rubro", "categoria", "categorias", "subrubro", "nombre", "descripcion")
+    CLAMP_SKU_PREFIXES = ("ABT", "ABL", "ABF")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._clamp_row_numbers = None
+
+    def prepare_frame(self, df):
+        df = super().prepare_frame(df)
+        if self._clamp_row_numbers is None:
+            self._clamp_row_numbers = set()
+        self._clamp_row_numbers.update(self._detect_clamp_rows(df))
+        return df
+
+    def _detect_clamp_rows(self, df):
+        """
+        Version vectorizada de _looks_like_clamp: evalua toda la planilla con
+        operaciones de columna y devuelve los numeros de fila que son abrazaderas.
+        """
+        mask = pd.Series(False, index=df.index)
+        for column in self.CLAMP_TEXT_COLUMNS:
+            if column not in df.columns:
+                continue
+            text = (
+                df[column]
+                .astype("string")
+                .fillna("")
+                .str.lower()
+                .str.normalize("NFKD")
+                .str.replace(r"[\u0300-\u036f]", "", regex=True)
+            )
+            mask |= text.str.contains("abrazadera", regex=False)
+        if "sku" in df.columns:
+            sku = df["sku"].astype("string").fillna("").str.strip().str.upper()
+            mask |= sku.str.startswith(self.CLAMP_SKU_PREFIXES)
+        # Mismo criterio de numeracion que BaseImporter.run (encabezado = fila 1).
+        return {int(index) + 2 for index in df.index[mask.to_numpy(dtype=bool)]}
+
+    def _is_clamp_row(self, row):
+        row_number = row.get("__row_number")
+        if self._clamp_row_numbers is None or row_number is None:
+            return self._looks_like_clamp(row)
+        return int(row_number) in self._clamp_row_numbers
+
     def _looks_like_clamp(self, row):
         searchable = " ".join(
             self._text(row.get(key))
@@ -44,7 +89,7 @@ class AbrazaderaImporter(ProductImporter):
         return names
 
     def process_row(self, row, dry_run=True):
-        if not self._looks_like_clamp(row):
+        if not self._is_clamp_row(row):
             return ImportRowResult(
                 row_number=0,
                 data={
@@ -60,7 +105,7 @@ class AbrazaderaImporter(ProductImporter):
         if result.success and dry_run:
             description = self._text(row.get("descripcion")) or self._text(row.get("nombre"))
             if description:
-                parsed = ClampParser.parse(description)
+                parsed = self._parse_clamp_text(description)
                 warnings = parsed.get("parse_warnings") or []
                 if warnings:
                     result.data = {
@@ -2,8 +2,9 @@
 Category assignment helpers for flexible product categorization.
 """
 import re
+from collections import defaultdict
 
-from django.db.models import Max, Min
+from django.db.models import Max
 
 from catalog.models import Category, CategoryProductOrder, Product
 
@@ -197,32 +198,31 @@ def _sync_primary_category_for_products(product_ids, preferred_primary_id=None):
     if not product_ids:
         return
 
-    qs = Product.objects.filter(id__in=product_ids)
-
     if preferred_primary_id:
         try:
             preferred_primary_id = int(preferred_primary_id)
         except (TypeError, ValueError):
             preferred_primary_id = None
 
+    # One scan of the through table builds both the category sets and the
+    # lowest category id per product (what Min("category_id") used to give).
+    categories_map = defaultdict(set)
+    first_map = {}
     through_qs = Product.categories.through.objects.filter(product_id__in=product_ids)
-    first_map = dict(
-        through_qs
-        .values("product_id")
-        .annotate(first_category_id=Min("category_id"))
-        .values_list("product_id", "first_category_id")
-    )
-    categories_map = {}
     for pid, cid in through_qs.values_list("product_id", "category_id"):
-        categories_map.setdefault(pid, set()).add(cid)
-
-    updates = []
-    for pid in qs.values_list("id", flat=True):
-        if preferred_primary_id and preferred_primary_id in categories_map.get(pid, set()):
+        categories_map[pid].add(cid)
+        if pid not in first_map or cid < first_map[pid]:
+            first_map[pid] = cid
+
+    # Few distinct primary ids per call: one UPDATE per category instead of
+    # a CASE/WHEN bulk_update over every product.
+    product_ids_by_category = defaultdict(list)
+    for pid in dict.fromkeys(product_ids):
+        if preferred_primary_id and preferred_primary_id in categories_map.get(pid, ()):
             cat_id = preferred_primary_id
         else:
             cat_id = first_map.get(pid)
-        updates.append(Product(id=pid, category_id=cat_id))
+        product_ids_by_category[cat_id].append(pid)
 
-    if updates:
-        Product.objects.bulk_update(updates, ["category"], batch_size=1000)
+    for cat_id, ids in product_ids_by_category.items():
+        Product.objects.filter(id__in=ids).update(category_id=cat_id)
@@ -1,6 +1,10 @@
 
+from functools import reduce
+import operator
+
 from core.services.importer import BaseImporter, ImportRowResult
 from catalog.models import Category
+from django.db.models import Q
 from django.utils.text import slugify
 
 class CategoryImporter(BaseImporter):
@@ -9,10 +13,59 @@ class CategoryImporter(BaseImporter):
     Required Headers: name
     Optional: parent, active
     """
-    
+
+    LOOKUP_CHUNK_SIZE = 200
+
     def __init__(self, file):
         super().__init__(file)
         self.required_columns = ['nombre']
+        self._cat_by_lcname = {}
+        self._slug_by_row = {}
+
+    def prepare_frame(self, df):
+        df = super().prepare_frame(df)
+        self._slug_by_row = self._slugify_names(df)
+        return df
+
+    @staticmethod
+    def _slugify_names(df):
+        """
+        Same steps as django's slugify, applied once per chunk to the text
+        cells of 'nombre'. Returns {row_number: slug}.
+        """
+        if 'nombre' not in df.columns:
+            return {}
+        names = df['nombre']
+        names = names[names.map(lambda value: isinstance(value, str))].astype(object)
+        slugs = (
+            names.str.normalize('NFKD')
+            .str.encode('ascii', 'ignore')
+            .str.decode('ascii')
+            .str.lower()
+            .str.replace(r'[^\w\s-]', '', regex=True)
+            .str.replace(r'[-\s]+', '-', regex=True)
+            .str.strip('-_')
+        )
+        return {int(index) + 2: slug for index, slug in slugs.items()}
+
+    def prepare_batch(self, rows, dry_run=True):
+        """
+        Resolve every 'nombre'/'padre' of the batch with a single query
+        instead of two lookups per row.
+        """
+        names = {
+            str(row.get(key, '')).strip()
+            for row in rows
+            for key in ('nombre', 'padre')
+        }
+        names = sorted(name for name in names if name and name.lower() not in self._cat_by_lcname)
+        # One OR of iexact lookups per chunk: SQLite rejects expression trees
+        # deeper than 1000 nodes, and a 500-row batch can hold ~1000 names.
+        for start in range(0, len(names), self.LOOKUP_CHUNK_SIZE):
+            chunk = names[start:start + self.LOOKUP_CHUNK_SIZE]
+            lookup = reduce(operator.or_, (Q(name__iexact=name) for name in chunk))
+            for category in Category.objects.filter(lookup):
+                self._cat_by_lcname.setdefault(category.name.lower(), category)
 
     def process_row(self, row, dry_run=True):
         result = ImportRowResult(row_number=0, data=row)
@@ -36,13 +89,14 @@ class CategoryImporter(BaseImporter):
         # Resolve Parent (Self-referential dependency is tricky in bulk, 
         # but simplistic approach: Parent must exist or be created now)
         if parent_name:
-            parent = Category.objects.filter(name__iexact=parent_name).first()
+            parent = self._cat_by_lcname.get(parent_name.lower())
             if not parent and not dry_run:
                 # Create parent on the fly? Or error?
                 # Let's create to be friendly
                 parent = Category.objects.create(name=parent_name, slug=slugify(parent_name))
+                self._cat_by_lcname[parent_name.lower()] = parent
         
-        category_exists = Category.objects.filter(name__iexact=name).exists()
+        category_exists = name.lower() in self._cat_by_lcname
         
         if dry_run:
             result.success = True
@@ -65,13 +119,16 @@ class CategoryImporter(BaseImporter):
             # but for import we assume Name is the key.
             
             # We need to be careful not to create duplicates if slug is the same.
-            slug = slugify(name)
+            slug = self._slug_by_row.get(row.get('__row_number'))
+            if slug is None:
+                slug = slugify(name)
             
             obj, created = Category.objects.update_or_create(
                 slug=slug,
                 defaults={**defaults, 'name': name}
             )
             
+            self._cat_by_lcname.setdefault(name.lower(), obj)
             result.success = True
             result.action = "created" if created else "updated"
             
@@ -10,8 +10,8 @@ The measurement compact segment has variable length.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 import re
 
 
@@ -72,19 +72,23 @@ DEFAULT_WIDTH_RANGE = (20, 300)
 DEFAULT_LENGTH_RANGE = (100, 1200)
 
 
-@dataclass
-class _SplitCandidate:
+class _SplitCandidate(NamedTuple):
+    # Field order is the ranking order: sorting the tuples (reverse=True)
+    # prefers higher score, 3-digit length, 3-digit width, shorter diameter
+    # and finally the enumeration order.
+    score: int
+    length_is_3_digits: bool
+    width_is_3_digits: bool
+    neg_diameter_len: int
+    neg_order: int
     diameter_compact: str
     width: int
     length: int
-    width_digits: int
-    length_digits: int
-    score: int
-    reasons: List[str]
 
 
+@lru_cache(maxsize=4096)
 def _normalize_key(value: str) -> str:
-    return re.sub(r"\s+", " ", str(value or "").strip().upper())
+    return " ".join(str(value or "").upper().split())
 
 
 def _compact_measure(
@@ -96,6 +100,11 @@ def _compact_measure(
     Returns compact measure + requires_mapping flag + warnings.
     """
     warnings: List[str] = []
+    # Camino rapido: la mayoria de las medidas ya llegan limpias ("1/2", "3/4").
+    key = str(human_measure or "").strip().upper()
+    if key in human_to_compact:
+        return human_to_compact[key], False, warnings
+
     normalized = _normalize_key(human_measure)
     if not normalized:
         raise ValueError("Diametro/medida principal es obligatorio.")
@@ -121,24 +130,65 @@ def _compact_measure(
     return compact, requires_mapping, warnings
 
 
+@lru_cache(maxsize=1024)
+def _compact_default_measure(human_measure: str, strict: bool = False) -> Tuple[str, bool, Tuple[str, ...]]:
+    """
+    Memoized _compact_measure for the default diameter table (the common case
+    in bulk imports, where a handful of diameters repeat on every row).
+    """
+    compact, requires_mapping, warnings = _compact_measure(
+        human_measure,
+        DIAMETER_HUMAN_TO_COMPACT_DEFAULT,
+        strict=strict,
+    )
+    return compact, requires_mapping, tuple(warnings)
+
+
+DEFAULT_KNOWN_DIAMETERS_COMPACT = frozenset(DIAMETER_COMPACT_TO_HUMAN_DEFAULT)
+
+
 def _split_numeric_core(
     numeric_core: str,
     known_widths: Optional[Iterable[int]],
     known_lengths: Optional[Iterable[int]],
     known_diameters_compact: Iterable[str],
 ) -> List[_SplitCandidate]:
-    known_widths_set = {int(v) for v in known_widths or []}
-    known_lengths_set = {int(v) for v in known_lengths or []}
-    known_diameters = {str(v) for v in known_diameters_compact}
+    if not isinstance(known_diameters_compact, frozenset):
+        known_diameters_compact = frozenset(str(v) for v in known_diameters_compact)
+    return list(
+        _split_numeric_core_for_catalog(
+            numeric_core,
+            frozenset(int(v) for v in known_widths or []),
+            frozenset(int(v) for v in known_lengths or []),
+            known_diameters_compact,
+        )
+    )
 
-    candidates: List[_SplitCandidate] = []
-    length_digit_candidates = [3]
-    if known_lengths_set:
-        length_digit_candidates = sorted({len(str(v)) for v in known_lengths_set}, reverse=True)
-        if 3 not in length_digit_candidates:
-            length_digit_candidates.append(3)
 
-    for length_digits in length_digit_candidates:
+@lru_cache(maxsize=64)
+def _length_digit_candidates(known_lengths_set: frozenset) -> Tuple[int, ...]:
+    """Digit counts to try for the length segment, specialized per catalog."""
+    if not known_lengths_set:
+        return (3,)
+    digits = sorted({len(str(v)) for v in known_lengths_set}, reverse=True)
+    if 3 not in digits:
+        digits.append(3)
+    return tuple(digits)
+
+
+@lru_cache(maxsize=4096)
+def _split_numeric_core_for_catalog(
+    numeric_core: str,
+    known_widths_set: frozenset,
+    known_lengths_set: frozenset,
+    known_diameters: frozenset,
+) -> Tuple[_SplitCandidate, ...]:
+    """
+    Ranked splits for one numeric core under a given catalog. Catalogs change
+    rarely, so both the per-catalog plan and each core's ranking are cached.
+    """
+    candidates: List[_SplitCandidate] = []
+    for length_digits in _length_digit_candidates(known_lengths_set):
         if len(numeric_core) <= length_digits + 2:
             continue
 
@@ -158,66 +208,59 @@ def _split_numeric_core(
 
             width_val = int(width_str)
             score = 0
-            reasons: List[str] = []
 
-            if diameter_compact in known_diameters:
-                score += 4
-                reasons.append("diametro conocido")
-            else:
-                score -= 1
-                reasons.append("diametro no mapeado")
+            # Diametro conocido / no mapeado.
+            score += 4 if diameter_compact in known_diameters else -1
 
+            # Ancho / largo plausibles.
             min_w, max_w = DEFAULT_WIDTH_RANGE
             min_l, max_l = DEFAULT_LENGTH_RANGE
             if min_w <= width_val <= max_w:
                 score += 2
-                reasons.append("ancho plausible")
             if min_l <= length_val <= max_l:
                 score += 2
-                reasons.append("largo plausible")
 
+            # Largo de 3 digitos preferido.
             if length_digits == 3:
                 score += 2
-                reasons.append("largo 3 digitos preferido")
 
+            # Coincidencia con catalogo de anchos / largos.
             if known_widths_set:
-                if width_val in known_widths_set:
-                    score += 6
-                    reasons.append("ancho coincide catalogo")
-                else:
-                    score -= 2
-                    reasons.append("ancho fuera catalogo")
-
+                score += 6 if width_val in known_widths_set else -2
             if known_lengths_set:
-                if length_val in known_lengths_set:
-                    score += 6
-                    reasons.append("largo coincide catalogo")
-                else:
-                    score -= 2
-                    reasons.append("largo fuera catalogo")
+                score += 6 if length_val in known_lengths_set else -2
 
             candidates.append(
                 _SplitCandidate(
-                    diameter_compact=diameter_compact,
-                    width=width_val,
-                    length=length_val,
-                    width_digits=width_digits,
-                    length_digits=length_digits,
-                    score=score,
-                    reasons=reasons,
+                    score,
+                    length_digits == 3,
+                    width_digits == 3,
+                    -len(diameter_compact),
+                    -len(candidates),
+                    diameter_compact,
+                    width_val,
+                    length_val,
                 )
             )
 
-    candidates.sort(
-        key=lambda c: (
-            c.score,
-            c.length_digits == 3,
-            c.width_digits == 3,
-            -(len(c.diameter_compact)),
-        ),
-        reverse=True,
-    )
-    return candidates
+    candidates.sort(reverse=True)
+    return tuple(candidates)
+
+
+def _split_code(code: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Split a normalized code into (prefix, numeric core, shape code).
+
+    Hand-written equivalent of re.fullmatch(r"(ABL|ABT|ABF)(\\d+)([CPS])", code).
+    """
+    if len(code) < 5:
+        return None
+    prefix = code[:3]
+    shape_code = code[-1]
+    numeric_core = code[3:-1]
+    if prefix not in PREFIX_TO_TYPE or shape_code not in SHAPE_CODE_TO_NAME or not numeric_core.isdecimal():
+        return None
+    return prefix, numeric_core, shape_code
 
 
 def parsearCodigo(
@@ -230,17 +273,21 @@ def parsearCodigo(
     """
     Parse a clamp code and return normalized attributes.
     """
-    code = _normalize_key(codigo)
-    match = re.fullmatch(r"(ABL|ABT|ABF)(\d+)([CPS])", code)
-    if not match:
+    code = str(codigo or "").strip().upper()
+    parts = _split_code(code)
+    if parts is None:
         raise ValueError("Codigo invalido. Debe cumplir formato ABL/ABT/ABF + numeros + C/P/S.")
 
-    prefix, numeric_core, shape_code = match.groups()
+    prefix, numeric_core, shape_code = parts
     clamp_type = PREFIX_TO_TYPE[prefix]
     shape_name = SHAPE_CODE_TO_NAME[shape_code]
 
-    compact_to_human = diameter_compact_to_human or DIAMETER_COMPACT_TO_HUMAN_DEFAULT
-    known_diameters_compact = compact_to_human.keys()
+    if diameter_compact_to_human:
+        compact_to_human = diameter_compact_to_human
+        known_diameters_compact = compact_to_human.keys()
+    else:
+        compact_to_human = DIAMETER_COMPACT_TO_HUMAN_DEFAULT
+        known_diameters_compact = DEFAULT_KNOWN_DIAMETERS_COMPACT
 
     candidates = _split_numeric_core(
         numeric_core=numeric_core,
@@ -321,15 +368,24 @@ def generarCodigo(
 
     prefix = TYPE_TO_PREFIX[raw_type]
     shape_code = SHAPE_NAME_TO_CODE[raw_shape]
-    map_to_use = human_to_compact or DIAMETER_HUMAN_TO_COMPACT_DEFAULT
-    diameter_compact, requires_mapping, warnings = _compact_measure(
-        diametro,
-        map_to_use,
-        strict=strict_diameter_mapping,
-    )
+    if human_to_compact:
+        diameter_compact, requires_mapping, warnings = _compact_measure(
+            diametro,
+            human_to_compact,
+            strict=strict_diameter_mapping,
+        )
+    else:
+        diameter_compact, requires_mapping, cached_warnings = _compact_default_measure(
+            diametro,
+            strict_diameter_mapping,
+        )
+        warnings = cached_warnings
 
     codigo = f"{prefix}{diameter_compact}{width_int}{length_int}{shape_code}"
-    result = {
+    if not with_metadata:
+        return codigo
+
+    return {
         "codigo": codigo,
         "prefijo": prefix,
         "tipo": PREFIX_TO_TYPE[prefix],
@@ -340,13 +396,9 @@ def generarCodigo(
         "largo": length_int,
         "forma_codigo": shape_code,
         "forma": SHAPE_CODE_TO_NAME[shape_code],
-        "warnings": warnings,
+        "warnings": list(warnings),
     }
 
-    if with_metadata:
-        return result
-    return codigo
-
 
 def generar_codigo(*args, **kwargs):
     return generarCodigo(*args, **kwargs)
@@ -0,0 +1,82 @@
+"""
+Carga opcional de los parsers de abrazaderas compilados con
+scripts/build_clamp_extensions.py.
+
+Las extensiones se generan en build/clamp_ext/ (nunca junto a los .py) con un
+manifiesto que guarda el sha256 de cada fuente. Solo se cargan si
+WEBFLEXS_CYTHON esta activo y la fuente no cambio desde la compilacion; si
+cambio, se registra una advertencia y se usa el modulo en Python puro hasta
+volver a correr el script.
+"""
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+EXTENSIONS_DIR = BASE_DIR / "build" / "clamp_ext"
+MANIFEST_NAME = "manifest.json"
+CLAMP_MODULES = ("catalog.services.clamp_code", "catalog.services.clamp_parser")
+
+
+def cython_enabled():
+    return str(os.environ.get("WEBFLEXS_CYTHON", "")).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def source_path(module_name):
+    return BASE_DIR / (module_name.replace(".", "/") + ".py")
+
+
+def source_digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def load_compiled_clamp_modules(build_dir=EXTENSIONS_DIR):
+    """
+    Registra en sys.modules las extensiones vigentes. Devuelve los nombres
+    de modulo cargados; ante cualquier problema se queda con Python puro.
+    """
+    if not cython_enabled():
+        return []
+    build_dir = Path(build_dir)
+    try:
+        manifest = json.loads((build_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+
+    loaded = []
+    for module_name in CLAMP_MODULES:
+        if module_name in sys.modules:
+            continue
+        entry = manifest.get(module_name) or {}
+        extension_path = build_dir / str(entry.get("path", ""))
+        try:
+            current_digest = source_digest(source_path(module_name))
+        except OSError:
+            continue
+        if entry.get("sha256") != current_digest or not extension_path.is_file():
+            logger.warning(
+                "La extension compilada de %s esta desactualizada; se usa Python puro. "
+                "Recompilar con scripts/build_clamp_extensions.py.",
+                module_name,
+            )
+            continue
+
+        spec = importlib.util.spec_from_file_location(module_name, extension_path)
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except Exception as exc:
+            sys.modules.pop(module_name, None)
+            logger.warning("No se pudo cargar la extension de %s (%s); se usa Python puro.", module_name, exc)
+            continue
+        loaded.append(module_name)
+    return loaded
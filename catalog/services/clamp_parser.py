@@ -1,10 +1,98 @@
 
 import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from math import ceil
 from typing import Dict, Any, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Variantes a unificar. SC se trata aparte porque necesita limites de palabra.
+_REPLACEMENTS = {
+    'S/CURVA': 'SEMICURVA',
+    'S-CURVA': 'SEMICURVA',
+    'S/C': 'SEMICURVA',
+    'CURV.': 'CURVA',
+}
+# Mas largas primero para que S/CURVA gane sobre S/C.
+_RE_REPLACEMENTS = re.compile(
+    '|'.join(re.escape(key) for key in sorted(_REPLACEMENTS, key=len, reverse=True))
+)
+_RE_SC = re.compile(r'\bSC\b')
+# Acentos ya en mayusculas (se aplica despues de upper()).
+_ACCENT_TABLE = str.maketrans('ÁÉÍÓÚÜÑ', 'AEIOUUN')
+# Patrones de medidas usados en parse (PASO 3.5, 4 y 5).
+_RE_COMPACT_DIMS = re.compile(r'([\d/]+)\sX\s(\d+)\sX\s(\d+)')
+_RE_DE = re.compile(r'\bDE\s+([\d/]+)')
+_RE_DIMS = re.compile(r'\sX\s(\d+)')
+# Formas en orden de prioridad; SEMICURVA primero para que gane sobre CURVA.
+_SHAPES = ('SEMICURVA', 'CURVA', 'PLANA')
+# Fabricaciones y formas en un solo barrido (PASO 3 y 6). Ninguna palabra
+# solapa con otra salvo CURVA dentro de SEMICURVA, que resuelve la prioridad.
+_RE_KEYWORDS = re.compile('|'.join(('TREFILADA', 'LAMINADA', 'FORJADA', *_SHAPES)))
+
+# Warnings como bits; los textos se arman al final, en este mismo orden.
+_WARN_AMBIGUOUS_FORJADA = 1 << 0
+_WARN_AMBIGUOUS_TREFILADA_LAMINADA = 1 << 1
+_WARN_MISSING_LENGTH = 1 << 2
+_WARN_MISSING_FABRICATION = 1 << 3
+_WARN_MISSING_DIAMETER = 1 << 4
+_WARN_MISSING_WIDTH = 1 << 5
+_WARN_MISSING_SHAPE = 1 << 6
+_WARNING_MESSAGES = (
+    (_WARN_AMBIGUOUS_FORJADA, "Ambigüedad: Detectadas FORJADA y otros tipos"),
+    (_WARN_AMBIGUOUS_TREFILADA_LAMINADA, "Ambigüedad: Detectadas ambas TREFILADA y LAMINADA"),
+    (_WARN_MISSING_LENGTH, "Falta Largo (solo se encontró una medida X)"),
+    (_WARN_MISSING_FABRICATION, "Falta: Fabricación"),
+    (_WARN_MISSING_DIAMETER, "Falta: Diámetro"),
+    (_WARN_MISSING_WIDTH, "Falta: Ancho"),
+    (_WARN_MISSING_SHAPE, "Falta: Forma"),
+)
+_NOT_A_CLAMP_WARNINGS = ("Ignorado: No comienza con 'ABRAZADERA'",)
+
+
+@lru_cache(maxsize=None)
+def _warning_messages(mask: int) -> tuple:
+    return tuple(message for bit, message in _WARNING_MESSAGES if mask & bit)
+
+
+@dataclass(slots=True)
+class ClampParseResult:
+    """
+    Resultado de ClampParser.parse. Acepta tambien el acceso por clave
+    (result['width'], result.get('width')) de cuando era un dict.
+    """
+    fabrication: Optional[str] = None
+    diameter: Optional[str] = None
+    width: Optional[int] = None
+    length: Optional[int] = None
+    shape: Optional[str] = None
+    parse_confidence: int = 100
+    parse_warnings: list = field(default_factory=list)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _replace_variant(match):
+    return _REPLACEMENTS[match.group(0)]
+
+
 class ClampParser:
     """
     Parser especializado para extraer especificaciones técnicas de Abrazaderas
@@ -17,7 +105,7 @@ class ClampParser:
     def normalize_text(text: str) -> str:
         """
         PASO 1 – Normalizar el texto
-        - Convertir a MAYÚSCULAS
+        - Convertir a MAYÚSCULAS y quitar acentos
         - Quitar espacios duplicados
         - Unificar variantes conocidas (S/CURVA -> SEMICURVA, etc)
         - Asegurar separadores claros (X rodeado de espacios)
@@ -25,78 +113,76 @@ class ClampParser:
         if not text:
             return ""
         
-        # 1. Mayúsculas y stripping
-        text = text.upper().strip()
-        
-        # 2. Reemplazos variantes
-        replacements = {
-            'S/CURVA': 'SEMICURVA',
-            'S-CURVA': 'SEMICURVA',
-            'S/C': 'SEMICURVA',
-            'CURV.': 'CURVA',
-            'SC': 'SEMICURVA',  # Shortcut for Forjadas
-        }
+        # 1. Mayúsculas. upper() tiene camino rapido para ASCII; la tabla de
+        # acentos solo se aplica cuando hace falta.
+        text = text.upper()
+        if not text.isascii():
+            text = text.translate(_ACCENT_TABLE)
         
-        for k, v in replacements.items():
-            # Use regex for whole word replacement to avoid partial matches if needed,
-            # but for SC/S/C usually direct replace is ok if normalized
-            # Let's be safer with word boundaries for SC
-            if k == 'SC':
-                text = re.sub(r'\bSC\b', v, text)
-            else:
-                text = text.replace(k, v)
-            
-        # 3. Espacios duplicados
-        text = re.sub(r'\s+', ' ', text)
-        
-        # 4. Asegurar separadores claros para X (dimensiones)
-        # "todo X rodeado de espacios -> X"
-        text = re.sub(r'\s*X\s*', ' X ', text)
-        
-        return text.strip()
+        # 2. Reemplazos variantes (una sola pasada) y SC como palabra completa.
+        # Los `in` previos (en C) evitan las pasadas de regex cuando no hay nada
+        # que reemplazar, que es el caso de la mayoria de las descripciones.
+        if 'S/C' in text or 'S-CURVA' in text or 'CURV.' in text:
+            text = _RE_REPLACEMENTS.sub(_replace_variant, text)
+        if 'SC' in text:
+            text = _RE_SC.sub('SEMICURVA', text)  # Shortcut for Forjadas
+
+        # 3. X rodeado de espacios + 4. espacios duplicados en el mismo paso
+        # (split/join ya recorta los extremos)
+        return " ".join(text.replace('X', ' X ').split())
 
     @classmethod
-    def parse(cls, text: str) -> Dict[str, Any]:
+    def parse(cls, text: str) -> ClampParseResult:
         """
         Analiza el texto y retorna estructura con datos y confianza.
+
+        El resultado se memoiza por texto (parse es puro); cada llamada recibe
+        su propio ClampParseResult y su propia lista de warnings.
         """
+        cached = _parse_cached(text)
+        return ClampParseResult(
+            cached.fabrication,
+            cached.diameter,
+            cached.width,
+            cached.length,
+            cached.shape,
+            cached.parse_confidence,
+            list(cached.parse_warnings),
+        )
+
+    @classmethod
+    def _parse(cls, text: str) -> ClampParseResult:
         # PASO 1 - Normalización
         text = cls.normalize_text(text)
         
-        result = {
-            'fabrication': None,
-            'diameter': None,
-            'width': None,
-            'length': None,
-            'shape': None,
-            'parse_confidence': 100,
-            'parse_warnings': []
-        }
-        
+        result = ClampParseResult(parse_warnings=())
+        warnings = 0
+
         # PASO 2 – Validar que sea una abrazadera
         if not text.startswith('ABRAZADERA'):
-            result['parse_warnings'].append("Ignorado: No comienza con 'ABRAZADERA'")
-            result['parse_confidence'] = 0
+            result.parse_warnings = _NOT_A_CLAMP_WARNINGS
+            result.parse_confidence = 0
             return result
         
         # PASO 3 – Detectar tipo de fabricación
-        has_trefilada = 'TREFILADA' in text
-        has_laminada = 'LAMINADA' in text
-        has_forjada = 'FORJADA' in text
+        keywords = set(_RE_KEYWORDS.findall(text))
+        has_trefilada = 'TREFILADA' in keywords
+        has_laminada = 'LAMINADA' in keywords
+        has_forjada = 'FORJADA' in keywords
         
         if has_forjada:
-             result['fabrication'] = 'FORJADA'
+             result.fabrication = 'FORJADA'
              # If ambiguous with others
              if has_trefilada or has_laminada:
-                 result['parse_warnings'].append("Ambigüedad: Detectadas FORJADA y otros tipos")
+                 warnings |= _WARN_AMBIGUOUS_FORJADA
         elif has_trefilada and has_laminada:
             # Ambiguno
-            result['parse_warnings'].append("Ambigüedad: Detectadas ambas TREFILADA y LAMINADA")
-            result['parse_confidence'] -= 20
+            warnings |= _WARN_AMBIGUOUS_TREFILADA_LAMINADA
+            result.parse_confidence -= 20
         elif has_trefilada:
-            result['fabrication'] = 'TREFILADA'
+            result.fabrication = 'TREFILADA'
         elif has_laminada:
-            result['fabrication'] = 'LAMINADA'
+            result.fabrication = 'LAMINADA'
         else:
             # Desconocido
             pass 
@@ -108,74 +194,118 @@ class ClampParser:
         
         # Regex for D x W x L
         # ([\d/]+) \sX\s (\d+) \sX\s (\d+)
-        compact_match = re.search(r'([\d/]+)\sX\s(\d+)\sX\s(\d+)', text)
+        compact_match = _RE_COMPACT_DIMS.search(text)
         
         if compact_match:
             # Compact match found, likely forjada style
-            result['diameter'] = compact_match.group(1)
-            result['width'] = int(compact_match.group(2))
-            result['length'] = int(compact_match.group(3))
+            result.diameter = compact_match.group(1)
+            result.width = int(compact_match.group(2))
+            result.length = int(compact_match.group(3))
             
             # Skip standard steps 4 & 5 if we found this strong match
         else:
             # PASO 4 – Detectar diámetro (Classic "DE ...")
             # Regla: El diámetro siempre viene después de la palabra DE
             # Buscar DE, leer token siguiente.
-            match_diam = re.search(r'\bDE\s+([\d/]+|\d+)', text)
+            match_diam = _RE_DE.search(text)
             if match_diam:
-                val = match_diam.group(1)
-                result['diameter'] = val
+                # El grupo ya es [\d/]+, no hace falta revalidarlo.
+                result.diameter = match_diam.group(1)
             
             # PASO 5 – Detectar ancho y largo
-            # Buscar todas las ocurrencias del patrón: X <número>
-            matches_dims = re.findall(r'\sX\s(\d+)', text)
-            
-            if len(matches_dims) >= 1:
+            # Recorrer las ocurrencias del patrón X <número>; solo importan las dos primeras.
+            matches_dims = _RE_DIMS.finditer(text)
+            first_dim = next(matches_dims, None)
+            if first_dim:
                 # El primer número encontrado -> ancho
-                result['width'] = int(matches_dims[0])
-                
-                if len(matches_dims) >= 2:
+                result.width = int(first_dim.group(1))
+
+                second_dim = next(matches_dims, None)
+                if second_dim:
                     # El segundo número encontrado -> largo
-                    result['length'] = int(matches_dims[1])
+                    result.length = int(second_dim.group(1))
                 else:
                     # Solo uno
-                    result['parse_warnings'].append("Falta Largo (solo se encontró una medida X)")
-            else:
-                # Ninguno
-                pass
+                    warnings |= _WARN_MISSING_LENGTH
 
         # PASO 6 – Detectar tipo (forma)
-        # Prioridad: SEMICURVA > CURVA > PLANA
-        if 'SEMICURVA' in text:
-            result['shape'] = 'SEMICURVA'
-        elif 'CURVA' in text:
-             # Check if it was part of Semicurva (already normalized so S/CURVA is SEMICURVA)
-             # Basic check to ensure we don't double match if the logic was weak, but if/elif handles priority
-             result['shape'] = 'CURVA'
-        elif 'PLANA' in text:
-            result['shape'] = 'PLANA'
-        # else None
+        # Prioridad: SEMICURVA > CURVA > PLANA (palabras halladas en el PASO 3)
+        result.shape = next((shape for shape in _SHAPES if shape in keywords), None)
 
         # PASO 7 – Validar coherencia
         # Marcar campos faltantes
-        if not result['fabrication']:
-             result['parse_warnings'].append("Falta: Fabricación")
-        if not result['diameter']:
-             result['parse_warnings'].append("Falta: Diámetro")
-             result['parse_warnings'].append("Falta: Diámetro")
-        if not result['width']:
-             result['parse_warnings'].append("Falta: Ancho")
-        if not result['shape']:
-             result['parse_warnings'].append("Falta: Forma")
-
-        # Ajustar confianza
-        if result['parse_warnings']:
-            # Simple penalty logic
-            result['parse_confidence'] -= (len(result['parse_warnings']) * 10)
-            if result['parse_confidence'] < 0:
-                result['parse_confidence'] = 0
+        if not result.fabrication:
+            warnings |= _WARN_MISSING_FABRICATION
+        if not result.diameter:
+            warnings |= _WARN_MISSING_DIAMETER
+        if not result.width:
+            warnings |= _WARN_MISSING_WIDTH
+        if not result.shape:
+            warnings |= _WARN_MISSING_SHAPE
+
+        # Ajustar confianza (simple penalty logic: -10 por warning)
+        if warnings:
+            result.parse_confidence = max(0, result.parse_confidence - warnings.bit_count() * 10)
+            result.parse_warnings = _warning_messages(warnings)
 
         # PASO 8 – Uso para filtros
-        # Los datos estructurados result['fabrication'], etc. se usarán para el modelo.
+        # Los datos estructurados result.fabrication, etc. se usarán para el modelo.
         
         return result
+
+
+@lru_cache(maxsize=4096)
+def _parse_cached(text: str) -> ClampParseResult:
+    # Solo lo lee ClampParser.parse, que devuelve copias.
+    return ClampParser._parse(text)
+
+
+def parse_clamp_text(text: str) -> ClampParseResult:
+    """Funcion de modulo (serializable con pickle) para usar en pools de procesos."""
+    return ClampParser.parse(text)
+
+
+def create_clamp_parse_pool(max_workers: int = 0):
+    """
+    Crea el pool de procesos para parse_clamp_texts, o None si max_workers <= 1.
+
+    Se crea una vez por importacion y lo cierra quien lo crea. Usa "spawn":
+    el importador corre en un hilo del proceso web y hacer fork de un proceso
+    con varios hilos puede dejar locks tomados en los hijos. Dentro de un
+    worker daemonico (Celery prefork) no se pueden crear hijos: devuelve None.
+    """
+    if max_workers <= 1:
+        return None
+    import multiprocessing
+
+    if multiprocessing.current_process().daemon:
+        return None
+    from concurrent.futures import ProcessPoolExecutor
+
+    try:
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    except (OSError, ValueError) as exc:
+        logger.warning("Parseo paralelo no disponible (%s); se usa parseo secuencial.", exc)
+        return None
+
+
+def parse_clamp_texts(texts, executor=None, max_workers: int = 1) -> Dict[str, ClampParseResult]:
+    """
+    Parsea varias descripciones y devuelve {texto: resultado}.
+
+    Con un executor de create_clamp_parse_pool reparte los textos en un
+    bloque por worker; ante cualquier falla del pool cae al parseo secuencial.
+    """
+    unique_texts = list(dict.fromkeys(text for text in texts if text))
+    if executor is not None and max_workers > 1 and len(unique_texts) > 1:
+        chunksize = ceil(len(unique_texts) / max_workers)
+        try:
+            parsed = list(executor.map(parse_clamp_text, unique_texts, chunksize=chunksize))
+            return dict(zip(unique_texts, parsed))
+        except Exception as exc:
+            # BrokenProcessPool, OSError, o AssertionError si el proceso es daemonico.
+            logger.warning("Parseo paralelo no disponible (%s); se usa parseo secuencial.", exc)
+    return {text: parse_clamp_text(text) for text in unique_texts}
@@ -6,6 +6,23 @@ from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from catalog.services.clamp_code import generarCodigo
 
 
+_ZERO = Decimal("0")
+_ONE = Decimal("1")
+_HUNDRED = Decimal("100")
+_THOUSAND = Decimal("1000")
+_MIN_RATE = Decimal("0.0001")
+# Factor de terminacion por (zincada, laminada). Laminadas cuestan la mitad
+# que las trefiladas; el zincado suma 20%.
+_FINISH_FACTORS = {
+    (False, False): Decimal("1"),
+    (True, False): Decimal("1.20"),
+    (False, True): Decimal("0.5"),
+    (True, True): Decimal("0.60"),
+}
+_CENTS = Decimal("0.01")
+_FOUR_PLACES = Decimal("0.0001")
+
+
 CLAMP_WEIGHT_MAP = {
     "7/16": Decimal("0.76"),
     "1/2": Decimal("0.993"),
@@ -21,6 +38,11 @@ CLAMP_WEIGHT_MAP = {
 }
 
 CLAMP_LAMINATED_ALLOWED_DIAMETERS = ("3/4", "1", "7/8")
+_LAMINATED_DIAMETERS = frozenset(CLAMP_LAMINATED_ALLOWED_DIAMETERS)
+_ALL_DIAMETER_OPTIONS = tuple(CLAMP_WEIGHT_MAP)
+_LAMINATED_DIAMETER_OPTIONS = tuple(
+    diameter for diameter in CLAMP_LAMINATED_ALLOWED_DIAMETERS if diameter in CLAMP_WEIGHT_MAP
+)
 
 CLAMP_PROFILE_ADJUSTMENTS = {
     "PLANA": Decimal("20"),
@@ -43,21 +65,25 @@ def get_allowed_diameter_options(clamp_type=None):
     - Trefilada: all known diameters
     - Laminada: restricted business subset
     """
-    all_options = list(CLAMP_WEIGHT_MAP.keys())
     normalized_type = str(clamp_type or "").strip().lower()
     if normalized_type == "laminada":
-        return [diameter for diameter in CLAMP_LAMINATED_ALLOWED_DIAMETERS if diameter in CLAMP_WEIGHT_MAP]
-    return all_options
-
-
-def parse_decimal_value(value, field_label, min_value=Decimal("0")):
-    raw = str(value if value is not None else "").strip().replace(",", ".")
-    if raw == "":
-        raise ValueError(f"{field_label} es obligatorio.")
-    try:
-        parsed = Decimal(raw)
-    except (InvalidOperation, ValueError):
-        raise ValueError(f"{field_label} es invalido.")
+        return list(_LAMINATED_DIAMETER_OPTIONS)
+    return list(_ALL_DIAMETER_OPTIONS)
+
+
+def parse_decimal_value(value, field_label, min_value=_ZERO):
+    if isinstance(value, Decimal):
+        parsed = value
+    elif isinstance(value, int) and not isinstance(value, bool):
+        parsed = Decimal(value)
+    else:
+        raw = str(value if value is not None else "").strip().replace(",", ".")
+        if raw == "":
+            raise ValueError(f"{field_label} es obligatorio.")
+        try:
+            parsed = Decimal(raw)
+        except (InvalidOperation, ValueError):
+            raise ValueError(f"{field_label} es invalido.")
     if parsed < min_value:
         raise ValueError(f"{field_label} no puede ser menor a {min_value}.")
     return parsed
@@ -65,9 +91,10 @@ def parse_decimal_value(value, field_label, min_value=Decimal("0")):
 
 def parse_int_value(value, field_label, min_value=0):
     raw = str(value if value is not None else "").strip()
-    if raw == "":
+    if not raw:
         raise ValueError(f"{field_label} es obligatorio.")
-    if not raw.isdigit():
+    # Solo digitos ASCII: int() tambien acepta "+5", "1_000" y digitos unicode.
+    if not raw.isascii() or not raw.isdigit():
         raise ValueError(f"{field_label} debe ser numerico.")
     parsed = int(raw)
     if parsed < min_value:
@@ -93,6 +120,9 @@ def calculate_clamp_quote(payload):
     profile_type = str(payload.get("profile_type", "PLANA")).strip().upper()
     diameter = str(payload.get("diameter", "")).strip()
     is_zincated = str(payload.get("is_zincated", "")).strip().lower() in {"1", "true", "on", "yes"}
+    include_code_metadata = (
+        str(payload.get("include_code_metadata", "1")).strip().lower() in {"1", "true", "on", "yes"}
+    )
 
     if clamp_type not in {"trefilada", "laminada"}:
         raise ValueError("Tipo de abrazadera invalido.")
@@ -100,44 +130,39 @@ def calculate_clamp_quote(payload):
         raise ValueError("Tipo invalido. Usa PLANA, SEMICURVA o CURVA.")
     if diameter not in CLAMP_WEIGHT_MAP:
         raise ValueError("Diametro invalido.")
-    if clamp_type == "laminada" and diameter not in CLAMP_LAMINATED_ALLOWED_DIAMETERS:
+    if clamp_type == "laminada" and diameter not in _LAMINATED_DIAMETERS:
         raise ValueError("Para abrazaderas laminadas solo se permiten diametros 3/4, 1 y 7/8.")
 
-    dollar_rate = parse_decimal_value(payload.get("dollar_rate"), "Dolar", min_value=Decimal("0.0001"))
+    dollar_rate = parse_decimal_value(payload.get("dollar_rate"), "Dolar", min_value=_MIN_RATE)
     steel_price_usd = parse_decimal_value(
         payload.get("steel_price_usd"),
         "Precio Acero (USD)",
-        min_value=Decimal("0.0001"),
+        min_value=_MIN_RATE,
     )
     supplier_discount_pct = parse_decimal_value(
         payload.get("supplier_discount_pct", "0"),
         "Desc. Proveedor (%)",
-        min_value=Decimal("0"),
+        min_value=_ZERO,
     )
     general_increase_pct = parse_decimal_value(
         payload.get("general_increase_pct", "23"),
         "Aumento Gral. (%)",
-        min_value=Decimal("0"),
+        min_value=_ZERO,
     )
     width_mm = parse_int_value(payload.get("width_mm"), "Ancho (mm)", min_value=1)
     length_mm = parse_int_value(payload.get("length_mm"), "Largo (mm)", min_value=1)
 
     adjustment = CLAMP_PROFILE_ADJUSTMENTS[profile_type]
-    development_meters = (Decimal(length_mm * 2) + Decimal(width_mm) + adjustment) / Decimal("1000")
+    development_meters = (Decimal(length_mm * 2 + width_mm) + adjustment) / _THOUSAND
     weight_per_meter = CLAMP_WEIGHT_MAP[diameter]
     total_weight_kg = development_meters * weight_per_meter
 
-    discount_factor = Decimal("1") - (supplier_discount_pct / Decimal("100"))
-    increase_factor = Decimal("1") + (general_increase_pct / Decimal("100"))
-    base_cost = total_weight_kg * steel_price_usd * discount_factor * dollar_rate * increase_factor
-
-    if is_zincated:
-        base_cost = base_cost * Decimal("1.20")
-    if clamp_type == "laminada":
-        # Business rule: laminated clamps cost half compared to trefiladas.
-        base_cost = base_cost / Decimal("2.0")
-
-    base_cost = base_cost.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    discount_factor = _ONE - (supplier_discount_pct / _HUNDRED)
+    increase_factor = _ONE + (general_increase_pct / _HUNDRED)
+    finish_factor = _FINISH_FACTORS[(is_zincated, clamp_type == "laminada")]
+    base_cost = (
+        total_weight_kg * steel_price_usd * discount_factor * dollar_rate * increase_factor * finish_factor
+    ).quantize(_CENTS, rounding=ROUND_HALF_UP)
     description = build_clamp_description(
         clamp_type=clamp_type,
         is_zincated=is_zincated,
@@ -153,20 +178,22 @@ def calculate_clamp_quote(payload):
         ancho=width_mm,
         largo=length_mm,
         forma=profile_type,
-        with_metadata=True,
+        with_metadata=include_code_metadata,
     )
-
-    price_rows = []
-    for key, label, multiplier in CLAMP_PRICE_LISTS:
-        final_price = (base_cost * multiplier).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        price_rows.append(
-            {
-                "key": key,
-                "label": label,
-                "multiplier": multiplier,
-                "final_price": final_price,
-            }
-        )
+    if include_code_metadata:
+        generated_code = code_generation["codigo"]
+    else:
+        generated_code, code_generation = code_generation, None
+
+    price_rows = [
+        {
+            "key": key,
+            "label": label,
+            "multiplier": multiplier,
+            "final_price": (base_cost * multiplier).quantize(_CENTS, rounding=ROUND_HALF_UP),
+        }
+        for key, label, multiplier in CLAMP_PRICE_LISTS
+    ]
 
     return {
         "inputs": {
@@ -184,9 +211,9 @@ def calculate_clamp_quote(payload):
         },
         "base_cost": base_cost,
         "description": description,
-        "generated_code": code_generation["codigo"],
+        "generated_code": generated_code,
         "generated_code_metadata": code_generation,
-        "development_meters": development_meters.quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP),
-        "total_weight_kg": total_weight_kg.quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP),
+        "development_meters": development_meters.quantize(_FOUR_PLACES, rounding=ROUND_HALF_UP),
+        "total_weight_kg": total_weight_kg.quantize(_FOUR_PLACES, rounding=ROUND_HALF_UP),
         "price_rows": price_rows,
     }
@@ -3,8 +3,10 @@ Helpers to materialize and publish custom clamp measure requests as products.
 """
 import re
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 
 from django.db import transaction
+from django.db.models import prefetch_related_objects
 from django.utils import timezone
 
 from catalog.models import Category, ClampMeasureRequest, ClampSpecs, Product
@@ -13,9 +15,17 @@ from catalog.services.clamp_quoter import calculate_clamp_quote
 
 ABRAZADERAS_CATEGORY_NAME = "ABRAZADERAS"
 GENERATED_SOURCE_KEY = "clamp_request"
+_SKU_DISALLOWED_RE = re.compile(r"[^A-Z0-9/_-]")
+_CENTS = Decimal("0.01")
+_MISSING = object()
 
 
 def _safe_decimal(value, fallback="0.00"):
+    # Model fields and quote results are already Decimal; skip the str() round-trip.
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return Decimal(value)
     try:
         return Decimal(str(value))
     except (InvalidOperation, ValueError, TypeError):
@@ -28,7 +38,7 @@ def _build_base_sku(clamp_request):
         prefix = "ABT" if clamp_request.clamp_type == "trefilada" else "ABL"
         raw_code = f"{prefix}REQ{clamp_request.pk}"
 
-    compact = re.sub(r"[^A-Z0-9/_-]", "", raw_code)
+    compact = _SKU_DISALLOWED_RE.sub("", raw_code)
     if not compact:
         compact = f"REQ{clamp_request.pk}"
     return compact[:50]
@@ -36,16 +46,21 @@ def _build_base_sku(clamp_request):
 
 def _build_unique_sku(base_sku, exclude_product_id=None):
     base = str(base_sku or "").strip()[:50] or "REQ"
-    if not Product.objects.filter(sku=base).exclude(pk=exclude_product_id).exists():
+    # Every candidate (base or base[:n] + "-R<counter>", counter < 10000)
+    # shares this prefix, so one query returns all possible conflicts.
+    taken = set(
+        Product.objects.filter(sku__startswith=base[:44])
+        .exclude(pk=exclude_product_id)
+        .values_list("sku", flat=True)
+    )
+    if base not in taken:
         return base
 
-    counter = 1
-    while counter < 10000:
+    for counter in range(1, 10000):
         suffix = f"-R{counter}"
         candidate = f"{base[: max(1, 50 - len(suffix))]}{suffix}"
-        if not Product.objects.filter(sku=candidate).exclude(pk=exclude_product_id).exists():
+        if candidate not in taken:
             return candidate
-        counter += 1
 
     return f"REQ-{timezone.now().strftime('%Y%m%d%H%M%S')}"[:50]
 
@@ -67,39 +82,49 @@ def _ensure_clamp_specs_values(
     length_mm,
     profile_type,
 ):
-    specs, created = ClampSpecs.objects.get_or_create(
-        product=product,
-        defaults={
-            "fabrication": str(clamp_type or "").upper(),
-            "diameter": diameter,
-            "width": width_mm,
-            "length": length_mm,
-            "shape": profile_type,
-            "parse_confidence": 100,
-            "parse_warnings": [],
-            "manual_override": True,
-        },
-    )
+    fabrication = str(clamp_type or "").upper()
+    specs = None
+    if Product.clamp_specs.is_cached(product):
+        # Loaded through select_related/prefetch: no lookup query needed.
+        specs = getattr(product, "clamp_specs", None)
+    if specs is not None:
+        created = False
+    else:
+        specs, created = ClampSpecs.objects.get_or_create(
+            product=product,
+            defaults={
+                "fabrication": fabrication,
+                "diameter": diameter,
+                "width": width_mm,
+                "length": length_mm,
+                "shape": profile_type,
+                "parse_confidence": 100,
+                "parse_warnings": [],
+                "manual_override": True,
+            },
+        )
 
     if created:
         return specs
 
-    changed = False
     target_values = {
-        "fabrication": str(clamp_type or "").upper(),
+        "fabrication": fabrication,
         "diameter": diameter,
         "width": width_mm,
         "length": length_mm,
         "shape": profile_type,
         "manual_override": True,
     }
-    for field, expected in target_values.items():
-        if getattr(specs, field) != expected:
-            setattr(specs, field, expected)
-            changed = True
+    changed = {field: expected for field, expected in target_values.items() if getattr(specs, field) != expected}
+    if not changed:
+        return specs
 
-    if changed:
-        specs.save(update_fields=list(target_values.keys()) + ["updated_at"])
+    # ClampSpecs is not audited: write only the differing columns with a
+    # queryset UPDATE and mirror them on the instance.
+    changed["updated_at"] = timezone.now()
+    ClampSpecs.objects.filter(pk=specs.pk).update(**changed)
+    for field, value in changed.items():
+        setattr(specs, field, value)
     return specs
 
 
@@ -115,25 +140,23 @@ def _ensure_clamp_specs(product, clamp_request):
 
 
 def _ensure_abrazaderas_category():
-    root_exact = (
-        Category.objects.filter(name__iexact=ABRAZADERAS_CATEGORY_NAME, parent__isnull=True)
+    # One query for both candidates: the exact ABRAZADERAS root wins, then
+    # any root containing ABRAZADERA, in (order, name, id) order.
+    candidates = list(
+        Category.objects.filter(name__icontains="ABRAZADERA", parent__isnull=True)
         .order_by("order", "name", "id")
-        .first()
     )
-    if root_exact:
-        category = root_exact
-    else:
-        category = (
-            Category.objects.filter(name__icontains="ABRAZADERA", parent__isnull=True)
-            .order_by("order", "name", "id")
-            .first()
+    exact_name = ABRAZADERAS_CATEGORY_NAME.lower()
+    category = next(
+        (candidate for candidate in candidates if candidate.name.lower() == exact_name),
+        candidates[0] if candidates else None,
+    )
+    if not category:
+        category = Category.objects.create(
+            name=ABRAZADERAS_CATEGORY_NAME,
+            is_active=True,
+            order=10,
         )
-        if not category:
-            category = Category.objects.create(
-                name=ABRAZADERAS_CATEGORY_NAME,
-                is_active=True,
-                order=10,
-            )
 
     if not category.is_active:
         category.is_active = True
@@ -143,7 +166,7 @@ def _ensure_abrazaderas_category():
 
 def _find_exact_match_by_specs(clamp_request):
     return (
-        Product.objects.select_related("category")
+        Product.objects.select_related("category", "clamp_specs")
         .prefetch_related("categories")
         .filter(
             clamp_specs__fabrication=clamp_request.clamp_type.upper(),
@@ -166,7 +189,7 @@ def _find_exact_match_by_values(
     profile_type,
 ):
     return (
-        Product.objects.select_related("category")
+        Product.objects.select_related("category", "clamp_specs")
         .prefetch_related("categories")
         .filter(
             clamp_specs__fabrication=str(clamp_type or "").upper(),
@@ -181,10 +204,10 @@ def _find_exact_match_by_values(
 
 
 def _build_generated_product_payload(clamp_request):
-    base_cost = _safe_decimal(clamp_request.base_cost).quantize(Decimal("0.01"))
+    base_cost = _safe_decimal(clamp_request.base_cost).quantize(_CENTS)
     confirmed_price = _safe_decimal(
         clamp_request.confirmed_price if clamp_request.confirmed_price is not None else clamp_request.estimated_final_price
-    ).quantize(Decimal("0.01"))
+    ).quantize(_CENTS)
     quantity = max(int(clamp_request.quantity or 1), 1)
     attrs = {
         "source": GENERATED_SOURCE_KEY,
@@ -215,8 +238,8 @@ def _build_quote_product_payload(
     generated_code = str(quote_result.get("generated_code") or "").strip().upper()
     return {
         "name": str(quote_result.get("description") or "ABRAZADERA A MEDIDA")[:255],
-        "cost": _safe_decimal(quote_result.get("base_cost")).quantize(Decimal("0.01")),
-        "price": _safe_decimal(final_price).quantize(Decimal("0.01")),
+        "cost": _safe_decimal(quote_result.get("base_cost")).quantize(_CENTS),
+        "price": _safe_decimal(final_price).quantize(_CENTS),
         "stock": max(int(stock or 1), 1),
         "description": (
             "Generado desde cotizador de abrazaderas. "
@@ -237,8 +260,8 @@ def _build_quote_product_payload(
 
 
 def _build_quote_payload(clamp_request):
+    # Only price inputs: the payload doubles as the _cached_quote key.
     return {
-        "client_name": clamp_request.client_name,
         "dollar_rate": clamp_request.dollar_rate,
         "steel_price_usd": clamp_request.steel_price_usd,
         "supplier_discount_pct": clamp_request.supplier_discount_pct,
@@ -249,37 +272,53 @@ def _build_quote_payload(clamp_request):
         "width_mm": clamp_request.width_mm,
         "length_mm": clamp_request.length_mm,
         "profile_type": clamp_request.profile_type,
+        # Solo se usan los precios; el codigo no necesita metadata.
+        "include_code_metadata": False,
     }
 
 
+@lru_cache(maxsize=512)
+def _cached_quote(fingerprint):
+    # Pure function of its inputs; callers only read the returned dict.
+    return calculate_clamp_quote(dict(fingerprint))
+
+
+def _try_quote(payload):
+    """Run the quoter; None when the stored inputs are no longer valid."""
+    try:
+        return _cached_quote(tuple(payload.items()))
+    except (ValueError, ArithmeticError):
+        # ValueError: validation messages; ArithmeticError: Decimal InvalidOperation.
+        return None
+
+
 def _calculate_facturacion_price(clamp_request):
     """
     Return (base_cost, facturacion_price) for a request.
     Falls back to stored values if the quote cannot be recalculated.
     """
-    fallback_base = _safe_decimal(clamp_request.base_cost).quantize(Decimal("0.01"))
+    fallback_base = _safe_decimal(clamp_request.base_cost).quantize(_CENTS)
     fallback_price = _safe_decimal(
         clamp_request.confirmed_price if clamp_request.confirmed_price is not None else clamp_request.estimated_final_price
-    ).quantize(Decimal("0.01"))
+    ).quantize(_CENTS)
     # If admin already confirmed "Facturacion", keep that exact confirmed value.
     if (
         str(clamp_request.confirmed_price_list or "").strip().lower() == "facturacion"
         and clamp_request.confirmed_price is not None
         and _safe_decimal(clamp_request.confirmed_price) > 0
     ):
-        return fallback_base, _safe_decimal(clamp_request.confirmed_price).quantize(Decimal("0.01"))
+        return fallback_base, _safe_decimal(clamp_request.confirmed_price).quantize(_CENTS)
 
-    try:
-        quote = calculate_clamp_quote(_build_quote_payload(clamp_request))
-        row_map = {row["key"]: row for row in quote.get("price_rows", [])}
-        facturacion_row = row_map.get("facturacion")
-        facturacion_price = _safe_decimal(
-            facturacion_row["final_price"] if facturacion_row else fallback_price
-        ).quantize(Decimal("0.01"))
-        return _safe_decimal(quote.get("base_cost", fallback_base)).quantize(Decimal("0.01")), facturacion_price
-    except Exception:
+    quote = _try_quote(_build_quote_payload(clamp_request))
+    if quote is None:
         return fallback_base, fallback_price
 
+    facturacion_row = next((row for row in quote["price_rows"] if row["key"] == "facturacion"), None)
+    facturacion_price = _safe_decimal(
+        facturacion_row["final_price"] if facturacion_row else fallback_price
+    ).quantize(_CENTS)
+    return _safe_decimal(quote["base_cost"]).quantize(_CENTS), facturacion_price
+
 
 @transaction.atomic
 def create_or_update_quote_product(
@@ -353,41 +392,34 @@ def create_or_update_quote_product(
         )
         created = True
     else:
-        update_fields = []
         existing_attrs = product.attributes if isinstance(product.attributes, dict) else {}
-        merged_attrs = dict(existing_attrs)
-        merged_attrs.update(payload["attributes"])
-        if product.name != payload["name"]:
-            product.name = payload["name"]
-            update_fields.append("name")
-        if product.supplier != supplier_name:
-            product.supplier = supplier_name
-            update_fields.append("supplier")
-        if product.description != payload["description"]:
-            product.description = payload["description"]
-            update_fields.append("description")
-        if product.cost != payload["cost"]:
-            product.cost = payload["cost"]
-            update_fields.append("cost")
-        if product.price != payload["price"]:
-            product.price = payload["price"]
-            update_fields.append("price")
-        if product.stock != payload["stock"]:
-            product.stock = payload["stock"]
-            update_fields.append("stock")
-        if activate_product and not product.is_active:
-            product.is_active = True
-            update_fields.append("is_active")
+        # Only the quoter keys are compared; the rest of the JSON is untouched.
+        attrs_diff = {
+            key: value for key, value in payload["attributes"].items() if existing_attrs.get(key, _MISSING) != value
+        }
+        desired = {
+            "name": payload["name"],
+            "supplier": supplier_name,
+            "description": payload["description"],
+            "cost": payload["cost"],
+            "price": payload["price"],
+            "stock": payload["stock"],
+        }
+        if activate_product:
+            desired["is_active"] = True
         if not product.category_id:
-            product.category = category
-            update_fields.append("category")
-        if product.attributes != merged_attrs:
-            product.attributes = merged_attrs
-            update_fields.append("attributes")
-        if update_fields:
-            product.save(update_fields=update_fields + ["updated_at"])
-
-    if not product.categories.filter(pk=category.pk).exists():
+            desired["category"] = category
+        changed = {field: value for field, value in desired.items() if getattr(product, field) != value}
+        if attrs_diff:
+            changed["attributes"] = {**existing_attrs, **attrs_diff}
+        if changed:
+            # Saved through the model (not a queryset update) so the audit
+            # signals still record quoter-driven price changes.
+            for field, value in changed.items():
+                setattr(product, field, value)
+            product.save(update_fields=[*changed, "updated_at"])
+
+    if all(linked.pk != category.pk for linked in product.categories.all()):
         product.categories.add(category)
 
     _ensure_clamp_specs_values(
@@ -401,6 +433,17 @@ def create_or_update_quote_product(
     return product, created, selected_row
 
 
+def _update_request_fields(clamp_request, values, now=None):
+    """
+    Write request fields with a single UPDATE (no model save/signals) and
+    mirror them on the instance so callers see the new state.
+    """
+    values["updated_at"] = now or timezone.now()
+    ClampMeasureRequest.objects.filter(pk=clamp_request.pk).update(**values)
+    for field, value in values.items():
+        setattr(clamp_request, field, value)
+
+
 @transaction.atomic
 def get_or_create_request_product(clamp_request):
     """
@@ -408,7 +451,16 @@ def get_or_create_request_product(clamp_request):
     If needed, create an internal product (hidden from catalog by default).
     """
     if clamp_request.linked_product_id:
-        product = Product.objects.filter(pk=clamp_request.linked_product_id).first()
+        if ClampMeasureRequest.linked_product.is_cached(clamp_request):
+            # Already loaded by the caller (e.g. the bulk publish prefetch).
+            product = clamp_request.linked_product
+        else:
+            product = (
+                Product.objects.select_related("category", "clamp_specs")
+                .prefetch_related("categories")
+                .filter(pk=clamp_request.linked_product_id)
+                .first()
+            )
         if product:
             if _is_generated_from_request(product, clamp_request.pk):
                 # If already published to catalog, keep catalog pricing untouched.
@@ -431,14 +483,13 @@ def get_or_create_request_product(clamp_request):
 
     matching_product = _find_exact_match_by_specs(clamp_request)
     if matching_product:
-        clamp_request.linked_product = matching_product
-        update_fields = ["linked_product", "updated_at"]
+        now = timezone.now()
+        values = {"linked_product": matching_product}
         if matching_product.is_visible_in_catalog(include_uncategorized=False):
-            clamp_request.exists_in_catalog = True
+            values["exists_in_catalog"] = True
             if not clamp_request.published_to_catalog_at:
-                clamp_request.published_to_catalog_at = timezone.now()
-            update_fields.extend(["exists_in_catalog", "published_to_catalog_at"])
-        clamp_request.save(update_fields=update_fields)
+                values["published_to_catalog_at"] = now
+        _update_request_fields(clamp_request, values, now=now)
         return matching_product, False
 
     payload = _build_generated_product_payload(clamp_request)
@@ -456,20 +507,13 @@ def get_or_create_request_product(clamp_request):
     )
     _ensure_clamp_specs(product, clamp_request)
 
-    clamp_request.linked_product = product
-    clamp_request.save(update_fields=["linked_product", "updated_at"])
+    _update_request_fields(clamp_request, {"linked_product": product})
     return product, True
 
 
-@transaction.atomic
-def publish_clamp_request_product(clamp_request):
-    """
-    Publish a request-linked clamp product into main catalog under ABRAZADERAS.
-    """
-    product, created = get_or_create_request_product(clamp_request)
-    was_visible = product.is_visible_in_catalog(include_uncategorized=False)
-    category = _ensure_abrazaderas_category()
-    recalculated_base_cost, facturacion_price = _calculate_facturacion_price(clamp_request)
+def _apply_published_product_values(product, category, prices):
+    """Activate and reprice a product being published; one save with the changed fields."""
+    recalculated_base_cost, facturacion_price = prices
 
     update_fields = []
     if not product.is_active:
@@ -487,25 +531,127 @@ def publish_clamp_request_product(clamp_request):
     if update_fields:
         product.save(update_fields=update_fields + ["updated_at"])
 
-    if not product.categories.filter(pk=category.pk).exists():
-        product.categories.add(category)
-
-    _ensure_clamp_specs(product, clamp_request)
 
-    now_visible = product.is_visible_in_catalog(include_uncategorized=False)
+def _mark_request_published(clamp_request, product, now_visible, now):
+    """Set the publish fields on the request and return the names that changed."""
     request_updates = []
     if clamp_request.linked_product_id != product.pk:
         clamp_request.linked_product = product
         request_updates.append("linked_product")
     if now_visible and not clamp_request.published_to_catalog_at:
-        clamp_request.published_to_catalog_at = timezone.now()
+        clamp_request.published_to_catalog_at = now
         request_updates.append("published_to_catalog_at")
     if now_visible and not clamp_request.exists_in_catalog:
         clamp_request.exists_in_catalog = True
         request_updates.append("exists_in_catalog")
+    return request_updates
 
+
+def publish_clamp_request_product(clamp_request):
+    """
+    Publish a request-linked clamp product into main catalog under ABRAZADERAS.
+    """
+    # The quote only reads the request row: run it before opening the
+    # transaction so row locks are not held during the calculation.
+    return _publish_clamp_request_product(clamp_request, _calculate_facturacion_price(clamp_request))
+
+
+@transaction.atomic
+def _publish_clamp_request_product(clamp_request, prices):
+    product, created = get_or_create_request_product(clamp_request)
+    # Load the direct categories once: both visibility checks and the
+    # membership check below read this cache (categories.add resets it).
+    prefetch_related_objects([product], "categories")
+    was_visible = product.is_visible_in_catalog(include_uncategorized=False)
+    category = _ensure_abrazaderas_category()
+
+    _apply_published_product_values(product, category, prices)
+    if all(linked.pk != category.pk for linked in product.categories.all()):
+        product.categories.add(category)
+
+    _ensure_clamp_specs(product, clamp_request)
+
+    now_visible = product.is_visible_in_catalog(include_uncategorized=False)
+    request_updates = _mark_request_published(clamp_request, product, now_visible, timezone.now())
     if request_updates:
         clamp_request.save(update_fields=request_updates + ["updated_at"])
 
     published_now = (not was_visible) and now_visible
     return product, created, published_now
+
+
+def publish_clamp_request_products_bulk(clamp_requests):
+    """
+    Publish many measure requests in one transaction.
+    Linked products (with categories and specs) are loaded up front,
+    ABRAZADERAS is resolved once and the category links and request
+    updates are written in bulk; returns one
+    (product, created, published_now) tuple per request.
+    """
+    clamp_requests = list(clamp_requests)
+    # Quotes first, outside the transaction (see publish_clamp_request_product).
+    prices = [_calculate_facturacion_price(clamp_request) for clamp_request in clamp_requests]
+    return _publish_clamp_request_products_bulk(clamp_requests, prices)
+
+
+@transaction.atomic
+def _publish_clamp_request_products_bulk(clamp_requests, prices):
+    # Fresh rows even when the caller already holds (possibly stale) linked products.
+    linked_products = (
+        Product.objects.select_related("category", "clamp_specs")
+        .prefetch_related("categories")
+        .in_bulk({clamp_request.linked_product_id for clamp_request in clamp_requests} - {None})
+    )
+    for clamp_request in clamp_requests:
+        if clamp_request.linked_product_id in linked_products:
+            clamp_request.linked_product = linked_products[clamp_request.linked_product_id]
+    category = _ensure_abrazaderas_category()
+
+    resolved = [get_or_create_request_product(clamp_request) for clamp_request in clamp_requests]
+    products = [product for product, _created in resolved]
+    prefetch_related_objects(products, "categories")
+    was_visible = [product.is_visible_in_catalog(include_uncategorized=False) for product in products]
+
+    unlinked = {
+        id(product): product
+        for product in products
+        if all(linked.pk != category.pk for linked in product.categories.all())
+    }
+    if unlinked:
+        through = Product.categories.through
+        through.objects.bulk_create(
+            [through(product_id=pk, category_id=category.pk) for pk in {p.pk for p in unlinked.values()}],
+            ignore_conflicts=True,
+        )
+        for product in unlinked.values():
+            # Drop only the stale categories prefetch; the line below reloads it.
+            product._prefetched_objects_cache.pop("categories", None)
+        prefetch_related_objects(list(unlinked.values()), "categories")
+
+    # Products are saved one by one (audit signals); requests are not audited
+    # and go out in a single bulk_update.
+    now = timezone.now()
+    results = []
+    requests_to_update = []
+    request_fields = set()
+    for clamp_request, (product, created), product_was_visible, request_prices in zip(
+        clamp_requests, resolved, was_visible, prices
+    ):
+        _apply_published_product_values(product, category, request_prices)
+        _ensure_clamp_specs(product, clamp_request)
+        now_visible = product.is_visible_in_catalog(include_uncategorized=False)
+        request_updates = _mark_request_published(clamp_request, product, now_visible, now)
+        if request_updates:
+            # bulk_update does not apply auto_now.
+            clamp_request.updated_at = now
+            requests_to_update.append(clamp_request)
+            request_fields.update(request_updates)
+        results.append((product, created, (not product_was_visible) and now_visible))
+
+    if requests_to_update:
+        ClampMeasureRequest.objects.bulk_update(
+            requests_to_update,
+            sorted(request_fields) + ["updated_at"],
+            batch_size=1000,
+        )
+    return results
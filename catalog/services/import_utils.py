@@ -9,6 +9,7 @@ from django.utils.text import slugify
 
 
 MONEY_QUANT = Decimal("0.01")
+_WHITESPACE_RE = re.compile(r"\s+")
 
 
 def is_blank(value):
@@ -23,9 +24,13 @@ def is_blank(value):
 
 
 def normalize_text(value):
+    if isinstance(value, str):
+        # Most cells are already text: no pd.isna()/str() round-trip needed.
+        text = value.strip()
+        return _WHITESPACE_RE.sub(" ", text) if text else ""
     if is_blank(value):
         return ""
-    return re.sub(r"\s+", " ", str(value).strip())
+    return _WHITESPACE_RE.sub(" ", str(value).strip())
 
 
 def normalize_header(value):
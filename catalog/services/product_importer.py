@@ -1,11 +1,12 @@
 from decimal import Decimal
 import json
 
+from django.conf import settings
 from django.db import transaction
 
 from core.services.importer import BaseImporter, ImportRowResult
-from catalog.models import Category, Product, ClampSpecs, ProductSupplier
-from catalog.services.clamp_parser import ClampParser
+from catalog.models import Category, Product, ClampSpecs, ProductSupplier, Supplier
+from catalog.services.clamp_parser import ClampParser, create_clamp_parse_pool, parse_clamp_texts
 from catalog.services.import_utils import (
     is_blank,
     normalize_columns,
@@ -290,6 +291,15 @@ class ProductImporter(BaseImporter):
         UPDATE_MODE_PRICES,
         UPDATE_MODE_CREATE_ONLY,
     }
+    CLAMP_SPEC_FIELDS = (
+        "fabrication",
+        "diameter",
+        "width",
+        "length",
+        "shape",
+        "parse_confidence",
+        "parse_warnings",
+    )
 
     def __init__(
         self,
@@ -304,6 +314,14 @@ class ProductImporter(BaseImporter):
         self.required_columns = ["sku"]
         self._seen_skus = {}
         self._seen_row_data = {}
+        self._category_cache = {}
+        self._supplier_cache = {}
+        self._row_clamp_specs = {}
+        self._pending_clamp_specs = {}
+        self._pending_clamp_rows = {}
+        self._parsed_clamp_texts = {}
+        self._clamp_parse_pool = None
+        self._batch_products = {}
         self.column_mapping_mode = "headers"
         self.is_global_base = _truthy_option(is_global_base, default=False)
         self.update_mode = update_mode or self.UPDATE_MODE_COMMERCIAL
@@ -326,31 +344,31 @@ class ProductImporter(BaseImporter):
         ):
             self.category_mode = self.CATEGORY_MODE_EXISTING
 
-    def load_data(self):
-        super().load_data()
-        self._drop_ignored_saas_fixed_columns()
-        self.df = self.df.dropna(how="all")
+    def prepare_frame(self, df):
+        df = super().prepare_frame(df)
+        df = self._drop_ignored_saas_fixed_columns(df)
+        df = df.dropna(how="all")
         mapped_columns, mapping_mode = normalize_columns(
-            self.df.columns,
+            df.columns,
             self.COLUMN_ALIASES,
             positional_columns=self.POSITIONAL_COLUMNS,
             required_any={"sku", "nombre", "precio", "precio_final"},
         )
-        self.df.columns = mapped_columns
+        df.columns = mapped_columns
         self.column_mapping_mode = mapping_mode
-        return True
+        return df
 
-    def _drop_ignored_saas_fixed_columns(self):
-        normalized_headers = [normalize_header(column) for column in self.df.columns]
+    def _drop_ignored_saas_fixed_columns(self, df):
+        normalized_headers = [normalize_header(column) for column in df.columns]
         if normalized_headers[: len(self.SAAS_FIXED_SIGNATURE)] != self.SAAS_FIXED_SIGNATURE:
-            return
+            return df
 
         kept_columns = [
             column
-            for index, column in enumerate(self.df.columns)
+            for index, column in enumerate(df.columns)
             if index not in self.SAAS_FIXED_IGNORED_COLUMN_INDEXES
         ]
-        self.df = self.df.loc[:, kept_columns]
+        return df.loc[:, kept_columns]
 
     @staticmethod
     def _text(value):
@@ -394,6 +412,26 @@ class ProductImporter(BaseImporter):
     def _resolve_category(self, name, parent=None, dry_run=True):
         if not name:
             return None
+        # Las mismas categorias (ABRAZADERAS, rubros) se repiten en casi todas
+        # las filas: se resuelven una sola vez por corrida de importacion.
+        cache_key = (name.lower(), parent.pk if parent else None)
+        if cache_key in self._category_cache:
+            return self._category_cache[cache_key]
+        category = self._lookup_or_create_category(name, parent=parent, dry_run=dry_run)
+        self._category_cache[cache_key] = category
+        return category
+
+    def _resolve_supplier(self, name):
+        # El mismo proveedor se repite en casi todas las filas: solo se vuelve
+        # a consultar (y renombrar) cuando cambia la escritura del nombre.
+        cache_key = Supplier.normalize_name(name)
+        supplier = self._supplier_cache.get(cache_key)
+        if supplier is None or supplier.name != name:
+            supplier = ensure_supplier(name)
+            self._supplier_cache[cache_key] = supplier
+        return supplier
+
+    def _lookup_or_create_category(self, name, parent=None, dry_run=True):
         qs = Category.objects.filter(name__iexact=name)
         if parent:
             qs = qs.filter(parent=parent)
@@ -419,13 +457,14 @@ class ProductImporter(BaseImporter):
             **category_defaults,
         )
 
-    def _assign_categories(self, product, row, dry_run=True):
+    def _resolve_row_categories(self, row, dry_run=True):
+        """Return (resolved categories, missing names) for the row."""
         if self.category_mode == self.CATEGORY_MODE_IGNORE:
-            return []
+            return [], []
 
         category_names = self._get_category_names(row)
         if not category_names:
-            return []
+            return [], []
 
         parent = None
         parent_name = self._get_parent_category_name(row)
@@ -446,14 +485,7 @@ class ProductImporter(BaseImporter):
             else:
                 missing.append(name)
 
-        if dry_run or not resolved:
-            return list(dict.fromkeys(missing))
-
-        product.categories.add(*resolved)
-        if product.category_id is None:
-            product.category = resolved[-1]
-            product.save(update_fields=["category", "updated_at"])
-        return list(dict.fromkeys(missing))
+        return resolved, list(dict.fromkeys(missing))
 
     def _parse_price(self, row, existing, errors):
         raw = row.get("precio_final")
@@ -588,10 +620,17 @@ class ProductImporter(BaseImporter):
     def process_row(self, row, dry_run=True):
         if dry_run:
             return self._process_row(row, dry_run=True)
+        self._row_clamp_specs = {}
         with transaction.atomic():
             result = self._process_row(row, dry_run=False)
             if not result.success:
                 transaction.set_rollback(True)
+                # Categorias y proveedores creados en esta fila se pierden con el rollback.
+                self._category_cache.clear()
+                self._supplier_cache.clear()
+            else:
+                self._pending_clamp_specs.update(self._row_clamp_specs)
+                self._pending_clamp_rows.update(dict.fromkeys(self._row_clamp_specs, result))
             return result
 
     def _process_row(self, row, dry_run=True):
@@ -616,7 +655,7 @@ class ProductImporter(BaseImporter):
             self._seen_skus[sku] = source_row_number or len(self._seen_skus) + 2
             self._seen_row_data[sku] = public_row_data
 
-        existing = Product.objects.filter(sku=sku).first() if sku else None
+        existing = self._get_existing_product(sku) if sku else None
         if existing and self.update_mode == self.UPDATE_MODE_CREATE_ONLY:
             result.data = {
                 "sku": sku,
@@ -668,7 +707,7 @@ class ProductImporter(BaseImporter):
             if preserve_categories:
                 result.data["categorias_preservadas"] = True
             else:
-                missing_categories = self._assign_categories(None, row, dry_run=True)
+                _resolved, missing_categories = self._resolve_row_categories(row, dry_run=True)
                 if missing_categories:
                     result.data["categorias_no_encontradas"] = missing_categories
             result.success = True
@@ -676,10 +715,25 @@ class ProductImporter(BaseImporter):
             return result
 
         try:
+            # Categories are resolved before the product is written so the
+            # primary category goes into the same INSERT/UPDATE (one audited
+            # save per row instead of two).
+            assign_categories = not (
+                existing
+                and (self.update_mode == self.UPDATE_MODE_PRICES or self.preserve_existing_categories)
+            )
+            categories, missing_categories = (
+                self._resolve_row_categories(row, dry_run=False) if assign_categories else ([], [])
+            )
+
             if existing:
                 product = existing
                 update_fields = []
 
+                if categories and product.category_id is None:
+                    product.category = categories[-1]
+                    update_fields.append("category")
+
                 if price is not None and product.price != price:
                     product.price = price
                     update_fields.append("price")
@@ -699,7 +753,7 @@ class ProductImporter(BaseImporter):
                         update_fields.append("description")
 
                     if supplier:
-                        supplier_ref = ensure_supplier(supplier)
+                        supplier_ref = self._resolve_supplier(supplier)
                         if product.supplier != supplier:
                             product.supplier = supplier
                             update_fields.append("supplier")
@@ -748,7 +802,7 @@ class ProductImporter(BaseImporter):
                     name=name,
                     description=self._text(row.get("descripcion")),
                     supplier=supplier,
-                    supplier_ref=ensure_supplier(supplier) if supplier else None,
+                    supplier_ref=self._resolve_supplier(supplier) if supplier else None,
                     cost=cost if cost is not None else Decimal("0.00"),
                     price=price if price is not None else Decimal("0.00"),
                     stock=stock if stock is not None else 0,
@@ -759,20 +813,32 @@ class ProductImporter(BaseImporter):
                     filter_4=self._text(row.get("filtro_4")),
                     filter_5=self._text(row.get("filtro_5")),
                     attributes=attributes or {},
+                    category=categories[-1] if categories else None,
                 )
                 created = True
 
+            linked_categories = None
+            if self.update_mode != self.UPDATE_MODE_PRICES:
+                # Se toman antes de .add(), que descarta las categorias precargadas.
+                linked_categories = (
+                    [*product.get_linked_categories(), *categories] if existing else list(categories)
+                )
+
             if existing and self.update_mode == self.UPDATE_MODE_PRICES:
                 result.data["categorias_preservadas"] = True
                 result.data["orden_manual_preservado"] = True
-            elif not (existing and self.preserve_existing_categories):
-                missing_categories = self._assign_categories(product, row, dry_run=False)
+            elif assign_categories:
+                if categories:
+                    product.categories.add(*categories)
                 if missing_categories:
                     result.data["categorias_no_encontradas"] = missing_categories
             else:
                 result.data["categorias_preservadas"] = True
             if self.update_mode != self.UPDATE_MODE_PRICES:
-                self.check_and_run_parser(product, dry_run=dry_run)
+                specs_data = self._parse_clamp_specs(product, linked_categories=linked_categories)
+                if specs_data is not None:
+                    # Se persiste en bloque al cerrar el lote (flush_batch).
+                    self._row_clamp_specs[product.pk] = specs_data
 
             if product.supplier_ref_id:
                 source_file = str(getattr(self.file, "name", "") or "")
@@ -814,7 +880,14 @@ class ProductImporter(BaseImporter):
         return result
 
     def run(self, dry_run=True, progress_callback=None):
-        results = super().run(dry_run=dry_run, progress_callback=progress_callback)
+        # Un solo pool de parseo por corrida (no uno por lote).
+        self._clamp_parse_pool = create_clamp_parse_pool(self._clamp_parse_workers())
+        try:
+            results = super().run(dry_run=dry_run, progress_callback=progress_callback)
+        finally:
+            if self._clamp_parse_pool is not None:
+                self._clamp_parse_pool.shutdown()
+                self._clamp_parse_pool = None
         
         if self.is_global_base:
             seen_skus = set(self._seen_skus.keys())
@@ -853,37 +926,154 @@ class ProductImporter(BaseImporter):
             
         return results
 
-    def check_and_run_parser(self, product, dry_run=False):
+    def _get_existing_product(self, sku):
+        # SKUs prefetched by prepare_batch resolve from memory (None when
+        # absent from the DB); rows processed outside a batch still query.
+        if sku in self._batch_products:
+            return self._batch_products[sku]
+        return Product.objects.filter(sku=sku).first()
+
+    def prepare_batch(self, rows, dry_run=True):
         """
-        Check if product is 'Abrazadera' and run parser.
+        Load the batch's existing products with one query and pre-parse the
+        descriptions (in a process pool when WEBFLEXS_IMPORT_WORKERS > 1)
+        so rows only look the results up.
         """
-        if not product or not product.name:
+        texts = []
+        skus = set()
+        for row in rows:
+            texts.append(self._text(row.get("descripcion")))
+            texts.append(self._text(row.get("nombre")))
+            sku = normalize_sku(row.get("sku"))
+            if sku:
+                skus.add(sku)
+        found = (
+            Product.objects.select_related("category")
+            .prefetch_related("categories")
+            .in_bulk(list(skus), field_name="sku")
+            if skus
+            else {}
+        )
+        self._batch_products = {sku: found.get(sku) for sku in skus}
+        self._parsed_clamp_texts = parse_clamp_texts(
+            texts,
+            executor=self._clamp_parse_pool,
+            max_workers=self._clamp_parse_workers(),
+        )
+
+    @staticmethod
+    def _clamp_parse_workers():
+        return getattr(settings, "WEBFLEXS_IMPORT_WORKERS", 0)
+
+    def flush_batch(self, dry_run=True):
+        """
+        Persist the ClampSpecs parsed for the batch with one upsert
+        (INSERT ... ON CONFLICT (product_id) DO UPDATE, Django >= 4.1).
+        If the upsert fails, fall back to one write per product so a bad
+        row only gets a warning on its own ImportRowResult instead of
+        aborting the whole run.
+        """
+        pending = self._pending_clamp_specs
+        rows = self._pending_clamp_rows
+        self._pending_clamp_specs = {}
+        self._pending_clamp_rows = {}
+        if dry_run or not pending:
             return
 
+        manual_ids = set(
+            ClampSpecs.objects.filter(
+                product_id__in=list(pending),
+                manual_override=True,
+            ).values_list("product_id", flat=True)
+        )
+        values_by_product = {
+            product_id: self._clamp_specs_values(specs_data)
+            for product_id, specs_data in pending.items()
+            if product_id not in manual_ids
+        }
+        if not values_by_product:
+            return
+
+        try:
+            with transaction.atomic():
+                ClampSpecs.objects.bulk_create(
+                    [ClampSpecs(product_id=product_id, **values) for product_id, values in values_by_product.items()],
+                    batch_size=self.get_batch_size(),
+                    update_conflicts=True,
+                    unique_fields=["product"],
+                    update_fields=[*self.CLAMP_SPEC_FIELDS, "updated_at"],
+                )
+        except Exception:
+            self._write_clamp_specs_per_product(values_by_product, rows)
+
+    def _write_clamp_specs_per_product(self, values_by_product, rows):
+        for product_id, values in values_by_product.items():
+            try:
+                with transaction.atomic():
+                    ClampSpecs.objects.update_or_create(product_id=product_id, defaults=values)
+            except Exception as exc:
+                self._warn_clamp_specs_error(rows.get(product_id), exc)
+
+    def _warn_clamp_specs_error(self, result, exc):
+        """
+        The row's product is already committed (and counted), so a failed
+        ClampSpecs write is a warning: the row stays a successful
+        created/updated row and keeps its import rollback reference.
+        """
+        if result is None:
+            return
+        result.errors.append(f"Advertencia: no se pudieron guardar las medidas de abrazadera: {exc}")
+
+    @staticmethod
+    def _clamp_specs_values(specs_data):
+        return {
+            "fabrication": specs_data.get("fabrication"),
+            "diameter": specs_data.get("diameter"),
+            "width": specs_data.get("width"),
+            "length": specs_data.get("length"),
+            "shape": specs_data.get("shape"),
+            "parse_confidence": specs_data.get("parse_confidence", 0),
+            "parse_warnings": specs_data.get("parse_warnings", []),
+        }
+
+    def _parse_clamp_specs(self, product, linked_categories=None):
+        """
+        Return ClampParser output when product is an 'Abrazadera', else None.
+        linked_categories (primary + linked, already in memory) skips the
+        category lookup.
+        """
+        if not product or not product.name:
+            return None
+
         is_clamp = product.name.upper().startswith("ABRAZADERA")
         if not is_clamp:
-            primary_category = product.get_primary_category()
-            if primary_category:
-                is_clamp = "ABRAZADERA" in primary_category.name.upper()
-            if not is_clamp:
-                is_clamp = product.categories.filter(name__icontains="ABRAZADERA").exists()
+            if linked_categories is None:
+                linked_categories = product.get_linked_categories()
+            is_clamp = any("ABRAZADERA" in category.name.upper() for category in linked_categories)
 
         if not is_clamp:
-            return
+            return None
 
-        specs_data = ClampParser.parse(product.description or product.name)
-        if dry_run:
+        return self._parse_clamp_text(product.description or product.name)
+
+    def _parse_clamp_text(self, text):
+        parsed = self._parsed_clamp_texts.get(text)
+        if parsed is None:
+            parsed = ClampParser.parse(text)
+        return parsed
+
+    def check_and_run_parser(self, product, dry_run=False):
+        """
+        Check if product is 'Abrazadera' and run parser.
+        """
+        specs_data = self._parse_clamp_specs(product)
+        if specs_data is None or dry_run:
             return
 
         specs, _created = ClampSpecs.objects.get_or_create(product=product)
         if specs.manual_override:
             return
 
-        specs.fabrication = specs_data.get("fabrication")
-        specs.diameter = specs_data.get("diameter")
-        specs.width = specs_data.get("width")
-        specs.length = specs_data.get("length")
-        specs.shape = specs_data.get("shape")
-        specs.parse_confidence = specs_data.get("parse_confidence", 0)
-        specs.parse_warnings = specs_data.get("parse_warnings", [])
+        for field, value in self._clamp_specs_values(specs_data).items():
+            setattr(specs, field, value)
         specs.save()
@@ -1,19 +1,45 @@
 from decimal import Decimal
 from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, PropertyMock, patch
+import json
+import os
+import sys
 
 from django.contrib.auth.models import User
 from django.core.cache import cache
-from django.test import Client, SimpleTestCase, TestCase
+from django.db import DatabaseError
+from django.test import Client, SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
+from django.utils.text import slugify
 from openpyxl import Workbook, load_workbook
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+import pandas as pd
 
 from accounts.models import ClientCompany, ClientProfile
 from catalog.services.abrazadera_importer import AbrazaderaImporter
+from catalog.services.category_assignment import (
+    add_category_to_products,
+    assign_categories_to_product,
+    remove_category_from_products,
+)
+from catalog.services.category_importer import CategoryImporter
+from catalog.services import clamp_extensions
 from catalog.services.clamp_code import generarCodigo, parsearCodigo
 from catalog.services.clamp_measure_parser import parse_clamp_measure
+from catalog.services.clamp_parser import ClampParser, ClampParseResult, create_clamp_parse_pool, parse_clamp_texts
+from catalog.services.clamp_quoter import build_clamp_description
+from catalog.services.clamp_request_products import (
+    _build_unique_sku,
+    _ensure_abrazaderas_category,
+    _ensure_clamp_specs_values,
+    _find_exact_match_by_values,
+)
 from catalog.services.product_importer import ProductImporter
-from catalog.models import Category, CategoryProductOrder, ClampMeasureRequest, ClampSpecs, Product
-from core.models import CatalogExcelTemplate, CatalogExcelTemplateColumn, CatalogExcelTemplateSheet
+from catalog.models import Category, CategoryProductOrder, ClampMeasureRequest, ClampSpecs, Product, Supplier
+from core.services.import_execution_runner import collect_created_refs
+from core.models import AdminAuditLog, CatalogExcelTemplate, CatalogExcelTemplateColumn, CatalogExcelTemplateSheet
 from core.services.catalog_excel_exporter import build_catalog_workbook
 from core.services.company_context import get_default_company
 from orders.models import CartItem
@@ -99,6 +125,12 @@ class ClampCodeTests(SimpleTestCase):
         self.assertEqual(parsed["largo"], 220)
         self.assertEqual(parsed["forma"], "CURVA")
 
+    def test_parse_rejects_malformed_codes(self):
+        self.assertEqual(parsearCodigo(" abf1882220c ")["codigo_normalizado"], "ABF1882220C")
+        for code in ("", "ABLC", "ABX1882220C", "ABF 18 82 220C", "ABF1882220X", "ABF18-82220C"):
+            with self.subTest(code=code), self.assertRaises(ValueError):
+                parsearCodigo(code)
+
     def test_generate_known_codes(self):
         code_1 = generarCodigo(
             tipo="ABT",
@@ -127,6 +159,16 @@ class ClampCodeTests(SimpleTestCase):
         )
         self.assertEqual(code_3, "ABL1135400C")
 
+    def test_generate_normalizes_spacing_in_inputs(self):
+        code = generarCodigo(
+            tipo=" trefilada ",
+            diametro="  3/4\t",
+            ancho=80,
+            largo=220,
+            forma="s   curva",
+        )
+        self.assertEqual(code, "ABT3480220S")
+
     def test_generate_unknown_fraction_marks_mapping_pending(self):
         metadata = generarCodigo(
             tipo="ABT",
@@ -152,6 +194,138 @@ class ClampCodeTests(SimpleTestCase):
             )
 
 
+class ClampParserTests(SimpleTestCase):
+    def test_normalize_text_unifies_variants_and_separators(self):
+        self.assertEqual(
+            ClampParser.normalize_text("  abrazadera  trefilada de 1/2x85   x260 s/curva "),
+            "ABRAZADERA TREFILADA DE 1/2 X 85 X 260 SEMICURVA",
+        )
+        self.assertEqual(
+            ClampParser.normalize_text("Abrazadera forjada 18x82x220 SC"),
+            "ABRAZADERA FORJADA 18 X 82 X 220 SEMICURVA",
+        )
+        self.assertEqual(
+            ClampParser.normalize_text("ABRAZADERA S-CURVA / S/C / CURV."),
+            "ABRAZADERA SEMICURVA / SEMICURVA / CURVA",
+        )
+        self.assertEqual(ClampParser.normalize_text(""), "")
+
+    def test_normalize_text_keeps_quoter_descriptions_unchanged(self):
+        description = build_clamp_description("trefilada", True, "7/16", 85, 260, "SEMICURVA")
+
+        self.assertEqual(ClampParser.normalize_text(description), description)
+        normalized = ClampParser.normalize_text("abrazadera s/c 7/16x85")
+        self.assertEqual(ClampParser.normalize_text(normalized), normalized)
+
+    def test_normalize_text_strips_accents(self):
+        self.assertEqual(
+            ClampParser.normalize_text("Abrazadera laminada de 3/4 x 70 x 180 plána ñ"),
+            "ABRAZADERA LAMINADA DE 3/4 X 70 X 180 PLANA N",
+        )
+
+    def test_parse_classic_description(self):
+        parsed = ClampParser.parse("ABRAZADERA TREFILADA DE 1/2 X 85 X 260 CURVA")
+        self.assertEqual(parsed["fabrication"], "TREFILADA")
+        self.assertEqual(parsed["diameter"], "1/2")
+        self.assertEqual(parsed["width"], 85)
+        self.assertEqual(parsed["length"], 260)
+        self.assertEqual(parsed["shape"], "CURVA")
+        self.assertEqual(parsed["parse_warnings"], [])
+        self.assertEqual(parsed["parse_confidence"], 100)
+
+    def test_parse_texts_in_process_pool_matches_sequential(self):
+        texts = [
+            "ABRAZADERA TREFILADA DE 7/16 X 85 X 260 CURVA",
+            "ABRAZADERA FORJADA 18 X 82 X 220 SC",
+            "ABRAZADERA LAMINADA DE 1/2 X 70 X 180 PLANA",
+            "ABRAZADERA TREFILADA DE 7/16 X 85 X 260 CURVA",
+            "",
+        ]
+        sequential = parse_clamp_texts(texts)
+        self.assertEqual(len(sequential), 3)
+        executor = create_clamp_parse_pool(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        self.assertEqual(parse_clamp_texts(texts, executor=executor, max_workers=2), sequential)
+
+    def test_parse_pool_is_not_created_inside_daemonic_workers(self):
+        with patch("multiprocessing.current_process", return_value=Mock(daemon=True)):
+            self.assertIsNone(create_clamp_parse_pool(max_workers=2))
+
+    def test_parse_texts_falls_back_to_sequential_when_pool_fails(self):
+        texts = ["ABRAZADERA TREFILADA DE 7/16 X 85 X 260 CURVA", "ABRAZADERA FORJADA 18 X 82 X 220 SC"]
+        executor = Mock()
+        executor.map.side_effect = AssertionError("daemonic processes are not allowed to have children")
+
+        with self.assertLogs("catalog.services.clamp_parser", level="WARNING"):
+            parsed = parse_clamp_texts(texts, executor=executor, max_workers=2)
+
+        self.assertEqual(parsed, parse_clamp_texts(texts))
+
+    def test_parse_returns_independent_results_for_cached_text(self):
+        first = ClampParser.parse("ABRAZADERA TREFILADA X 85 X 260 CURVA")
+        first["parse_warnings"].append("mutado")
+        first["shape"] = "PLANA"
+
+        second = ClampParser.parse("ABRAZADERA TREFILADA X 85 X 260 CURVA")
+        self.assertEqual(second["parse_warnings"], ["Falta: Diámetro"])
+        self.assertEqual(second["shape"], "CURVA")
+
+    def test_parse_shape_follows_priority_not_position(self):
+        self.assertEqual(ClampParser.parse("ABRAZADERA PLANA TREFILADA DE 1/2 X 70 X 180 CURVA")["shape"], "CURVA")
+        self.assertEqual(ClampParser.parse("ABRAZADERA CURVA TREFILADA DE 1/2 X 70 X 180 S/C")["shape"], "SEMICURVA")
+        self.assertIsNone(ClampParser.parse("ABRAZADERA TREFILADA DE 1/2 X 70 X 180")["shape"])
+
+    def test_parse_result_keeps_dict_style_access(self):
+        parsed = ClampParser.parse("ABRAZADERA LAMINADA DE 3/4 X 70 X 180 PLANA")
+        self.assertIsInstance(parsed, ClampParseResult)
+        self.assertEqual(parsed.width, 70)
+        self.assertEqual(parsed.get("shape"), "PLANA")
+        self.assertEqual(parsed.get("missing", 0), 0)
+        with self.assertRaises(KeyError):
+            parsed["missing"]
+        self.assertEqual(
+            parsed.as_dict(),
+            {
+                "fabrication": "LAMINADA",
+                "diameter": "3/4",
+                "width": 70,
+                "length": 180,
+                "shape": "PLANA",
+                "parse_confidence": 100,
+                "parse_warnings": [],
+            },
+        )
+
+    def test_parse_missing_diameter_is_penalized_once(self):
+        parsed = ClampParser.parse("ABRAZADERA TREFILADA X 85 X 260 CURVA")
+        self.assertIsNone(parsed["diameter"])
+        self.assertEqual(parsed["parse_warnings"], ["Falta: Diámetro"])
+        self.assertEqual(parsed["parse_confidence"], 90)
+
+    def test_compiled_clamp_modules_are_not_loaded_when_stale(self):
+        with TemporaryDirectory() as build_dir:
+            manifest = {
+                name: {"path": f"{name.replace('.', '/')}.so", "sha256": "viejo"}
+                for name in clamp_extensions.CLAMP_MODULES
+            }
+            Path(build_dir, clamp_extensions.MANIFEST_NAME).write_text(json.dumps(manifest), encoding="utf-8")
+            with patch.dict(os.environ, {"WEBFLEXS_CYTHON": "1"}), patch.dict(sys.modules):
+                for name in clamp_extensions.CLAMP_MODULES:
+                    sys.modules.pop(name, None)
+                with self.assertLogs("catalog.services.clamp_extensions", level="WARNING") as logs:
+                    loaded = clamp_extensions.load_compiled_clamp_modules(build_dir)
+                self.assertNotIn("catalog.services.clamp_parser", sys.modules)
+
+        self.assertEqual(loaded, [])
+        self.assertEqual(len(logs.records), len(clamp_extensions.CLAMP_MODULES))
+        self.assertIn("desactualizada", logs.output[0])
+
+    def test_compiled_clamp_modules_require_opt_in(self):
+        with patch.dict(os.environ, {"WEBFLEXS_CYTHON": ""}), patch.object(Path, "read_text") as read_text:
+            self.assertEqual(clamp_extensions.load_compiled_clamp_modules(), [])
+        read_text.assert_not_called()
+
+
 class ProductImportTests(CatalogTestCase):
     def test_product_import_accepts_header_file_without_supplier(self):
         file_obj = build_import_workbook(
@@ -173,6 +347,86 @@ class ProductImportTests(CatalogTestCase):
         self.assertTrue(product.categories.filter(name="Prueba").exists())
         self.assertEqual(product.attributes, {"Color": "Rojo", "Material": "Acero"})
 
+    def test_product_import_writes_new_product_with_primary_category_once(self):
+        category = Category.objects.create(name="Primaria importada", is_active=True)
+        file_obj = build_import_workbook(
+            ["SKU", "Nombre", "Precio", "Categoria"],
+            [["IMP-PRIM", "Producto con categoria", 100, "Primaria importada"]],
+        )
+
+        result = ProductImporter(file_obj).run(dry_run=False)
+
+        self.assertEqual(result.errors, 0)
+        product = Product.objects.get(sku="IMP-PRIM")
+        self.assertEqual(product.category_id, category.id)
+        self.assertEqual(list(product.categories.values_list("id", flat=True)), [category.id])
+        self.assertEqual(
+            list(
+                AdminAuditLog.objects.filter(
+                    target_type="catalog.product",
+                    target_id=str(product.pk),
+                ).values_list("action", flat=True)
+            ),
+            ["entity_create"],
+        )
+
+    def test_product_import_loads_existing_skus_once_per_batch(self):
+        Product.objects.create(sku="IMP-EX-1", name="Existente 1", price=Decimal("10.00"))
+        Product.objects.create(sku="IMP-EX-2", name="Existente 2", price=Decimal("20.00"))
+        file_obj = build_import_workbook(
+            ["SKU", "Nombre", "Precio"],
+            [
+                ["IMP-EX-1", "Existente 1", 11],
+                ["IMP-EX-2", "Existente 2", 21],
+                ["IMP-NEW-1", "Nuevo", 30],
+            ],
+        )
+        importer = ProductImporter(file_obj)
+
+        with self.assertNumQueries(2):
+            result = importer.run(dry_run=True)
+
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(result.updated, 2)
+        self.assertEqual(result.created, 1)
+
+    def test_product_import_reuses_supplier_across_rows(self):
+        file_obj = build_import_workbook(
+            ["SKU", "Nombre", "Precio", "Proveedor"],
+            [
+                ["IMP-SUP-1", "Producto 1", 10, "Proveedor Uno"],
+                ["IMP-SUP-2", "Producto 2", 20, "Proveedor Uno"],
+                ["IMP-SUP-3", "Producto 3", 30, "PROVEEDOR UNO"],
+            ],
+        )
+
+        result = ProductImporter(file_obj).run(dry_run=False)
+
+        self.assertEqual(result.errors, 0)
+        supplier = Supplier.objects.get(normalized_name="PROVEEDOR UNO")
+        self.assertEqual(supplier.name, "PROVEEDOR UNO")
+        self.assertEqual(
+            Product.objects.filter(sku__startswith="IMP-SUP-", supplier_ref=supplier).count(),
+            3,
+        )
+
+    def test_product_import_detects_clamp_by_existing_linked_category(self):
+        category = Category.objects.create(name="Abrazaderas especiales", is_active=True)
+        product = Product.objects.create(
+            sku="IMP-U-1",
+            name="Pieza U",
+            description="ABRAZADERA TREFILADA DE 1/2 X 85 X 260 CURVA",
+            price=Decimal("10.00"),
+        )
+        product.categories.add(category)
+        file_obj = build_import_workbook(["SKU", "Nombre", "Precio"], [["IMP-U-1", "Pieza U", 12]])
+
+        result = ProductImporter(file_obj).run(dry_run=False)
+
+        self.assertEqual(result.errors, 0)
+        specs = ClampSpecs.objects.get(product=product)
+        self.assertEqual((specs.diameter, specs.width, specs.length), ("1/2", 85, 260))
+
     def test_product_import_does_not_create_categories_by_default(self):
         file_obj = build_import_workbook(
             ["SKU", "Nombre", "Precio", "Categoria"],
@@ -737,6 +991,129 @@ class ProductImportTests(CatalogTestCase):
         self.assertTrue(product.categories.filter(name="Abrazaderas").exists())
         self.assertTrue(hasattr(product, "clamp_specs"))
 
+    def test_abrazadera_import_resolves_shared_category_once(self):
+        Category.objects.create(name="Abrazaderas", is_active=True)
+        file_obj = build_import_workbook(
+            ["sku", "nombre", "precio", "stock", "categoria"],
+            [
+                ["ABR-CAT-1", "ABRAZADERA TREFILADA DE 1/2 X 85 X 260 CURVA", "100", 1, "Abrazaderas"],
+                ["ABR-CAT-2", "ABRAZADERA TREFILADA DE 5/8 X 90 X 280 PLANA", "120", 1, "Abrazaderas"],
+            ],
+        )
+        importer = AbrazaderaImporter(file_obj)
+
+        result = importer.run(dry_run=False)
+
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(list(importer._category_cache), [("abrazaderas", None)])
+        self.assertEqual(Category.objects.filter(name__iexact="abrazaderas").count(), 1)
+        for sku in ("ABR-CAT-1", "ABR-CAT-2"):
+            product = Product.objects.get(sku=sku)
+            self.assertTrue(product.categories.filter(name="Abrazaderas").exists())
+
+    def test_abrazadera_import_bulk_writes_specs_and_respects_manual_override(self):
+        manual = Product.objects.create(sku="ABR-MAN", name="ABRAZADERA MANUAL", price=Decimal("1.00"))
+        ClampSpecs.objects.create(product=manual, diameter="7/8", width=70, manual_override=True)
+        parsed = Product.objects.create(sku="ABR-AUTO", name="ABRAZADERA AUTO", price=Decimal("1.00"))
+        ClampSpecs.objects.create(product=parsed, diameter="7/8", width=70)
+        file_obj = build_import_workbook(
+            ["sku", "nombre", "precio"],
+            [
+                ["ABR-MAN", "ABRAZADERA TREFILADA DE 1/2 X 85 X 260 CURVA", "100"],
+                ["ABR-AUTO", "ABRAZADERA TREFILADA DE 5/8 X 90 X 280 PLANA", "120"],
+                ["ABR-NEW", "ABRAZADERA LAMINADA DE 3/4 X 80 X 220 SEMICURVA", "130"],
+            ],
+        )
+
+        result = AbrazaderaImporter(file_obj, preserve_existing_categories=False).run(dry_run=False)
+
+        self.assertEqual(result.errors, 0)
+        manual_specs = ClampSpecs.objects.get(product__sku="ABR-MAN")
+        self.assertEqual((manual_specs.diameter, manual_specs.width), ("7/8", 70))
+        auto_specs = ClampSpecs.objects.get(product__sku="ABR-AUTO")
+        self.assertEqual((auto_specs.diameter, auto_specs.width, auto_specs.shape), ("5/8", 90, "PLANA"))
+        new_specs = ClampSpecs.objects.get(product__sku="ABR-NEW")
+        self.assertEqual((new_specs.fabrication, new_specs.length), ("LAMINADA", 220))
+
+    def test_abrazadera_import_falls_back_to_per_product_specs_when_upsert_fails(self):
+        file_obj = build_import_workbook(
+            ["sku", "nombre", "precio"],
+            [
+                ["ABR-FB-1", "ABRAZADERA TREFILADA DE 1/2 X 85 X 260 CURVA", "100"],
+                ["ABR-FB-2", "ABRAZADERA TREFILADA DE 5/8 X 90 X 280 PLANA", "120"],
+            ],
+        )
+
+        with patch.object(ClampSpecs.objects, "bulk_create", side_effect=DatabaseError("upsert")):
+            result = AbrazaderaImporter(file_obj).run(dry_run=False)
+
+        self.assertEqual((result.created, result.errors), (2, 0))
+        specs = ClampSpecs.objects.get(product__sku="ABR-FB-2")
+        self.assertEqual((specs.diameter, specs.width, specs.shape), ("5/8", 90, "PLANA"))
+
+    def test_abrazadera_import_keeps_rollback_ref_when_specs_write_fails(self):
+        file_obj = build_import_workbook(
+            ["sku", "nombre", "precio"],
+            [["ABR-FAIL", "ABRAZADERA TREFILADA DE 1/2 X 85 X 260 CURVA", "100"]],
+        )
+
+        with patch.object(ClampSpecs.objects, "bulk_create", side_effect=DatabaseError("upsert")), patch.object(
+            ClampSpecs.objects, "update_or_create", side_effect=DatabaseError("fila")
+        ):
+            result = AbrazaderaImporter(file_obj).run(dry_run=False)
+
+        self.assertEqual((result.created, result.errors), (1, 0))
+        row = result.row_results[0]
+        self.assertTrue(row.success)
+        self.assertEqual(row.action, "created")
+        self.assertIn("Advertencia: no se pudieron guardar las medidas de abrazadera: fila", row.errors)
+        self.assertFalse(ClampSpecs.objects.filter(product__sku="ABR-FAIL").exists())
+        # The committed product stays reachable by the import rollback.
+        self.assertEqual(collect_created_refs("abrazaderas", result.row_results), ["ABR-FAIL"])
+
+    @override_settings(WEBFLEXS_IMPORT_WORKERS=2, IMPORT_BATCH_SIZE=2)
+    def test_abrazadera_import_uses_one_parse_pool_per_run(self):
+        file_obj = build_import_workbook(
+            ["sku", "nombre", "precio"],
+            [
+                ["ABR-POOL-1", "ABRAZADERA TREFILADA DE 1/2 X 85 X 260 CURVA", "100"],
+                ["ABR-POOL-2", "ABRAZADERA TREFILADA DE 5/8 X 90 X 280 PLANA", "120"],
+                ["ABR-POOL-3", "ABRAZADERA LAMINADA DE 3/4 X 80 X 220 SEMICURVA", "130"],
+            ],
+        )
+        importer = AbrazaderaImporter(file_obj)
+
+        with patch(
+            "catalog.services.product_importer.create_clamp_parse_pool",
+            wraps=create_clamp_parse_pool,
+        ) as create_pool:
+            result = importer.run(dry_run=False)
+
+        create_pool.assert_called_once_with(2)
+        self.assertIsNone(importer._clamp_parse_pool)
+        self.assertEqual(result.created, 3)
+        specs = ClampSpecs.objects.get(product__sku="ABR-POOL-2")
+        self.assertEqual((specs.diameter, specs.width), ("5/8", 90))
+
+    def test_abrazadera_vectorized_detection_matches_row_detection(self):
+        rows = [
+            ["ABT3480220S", "Pieza sin rubro", "", "100"],
+            ["X-1", "Abrazádera trefilada", "", "100"],
+            ["X-2", "Perno", "ABRAZADERAS", "100"],
+            ["X-3", "Buje de goma", "Bujes", "100"],
+            [1234, "Tornillo", None, "100"],
+        ]
+        importer = AbrazaderaImporter(build_import_workbook(["sku", "nombre", "rubro", "precio"], rows))
+        importer.load_data()
+
+        expected = set()
+        for index, row in importer.df.iterrows():
+            if importer._looks_like_clamp(row.to_dict()):
+                expected.add(index + 2)
+
+        self.assertEqual(importer._clamp_row_numbers, expected)
+        self.assertEqual(expected, {2, 3, 4})
+
     def test_abrazadera_import_skips_non_clamp_rows(self):
         file_obj = build_import_workbook(
             ["Codigo", "Nombre", "Rubro", "Precio Final ($)"],
@@ -750,6 +1127,212 @@ class ProductImportTests(CatalogTestCase):
         self.assertFalse(Product.objects.filter(sku="BUJE-IMP").exists())
 
 
+class CategoryImportTests(CatalogTestCase):
+    def test_category_import_resolves_and_creates_parents_once(self):
+        Category.objects.create(name="Suspension", is_active=True)
+        file_obj = build_import_workbook(
+            ["nombre", "padre"],
+            [
+                ["Bujes", "SUSPENSION"],
+                ["Elasticos", "Suspension"],
+                ["Crapodinas", "Embrague"],
+                ["Discos", "embrague"],
+            ],
+        )
+
+        preview = CategoryImporter(file_obj).run(dry_run=True)
+        self.assertEqual(preview.created, 4)
+
+        file_obj.seek(0)
+        result = CategoryImporter(file_obj).run(dry_run=False)
+
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(Category.objects.filter(name__iexact="embrague").count(), 1)
+        suspension = Category.objects.get(name="Suspension")
+        embrague = Category.objects.get(name="Embrague")
+        self.assertEqual(Category.objects.get(name="Bujes").parent, suspension)
+        self.assertEqual(Category.objects.get(name="Elasticos").parent, suspension)
+        self.assertEqual(Category.objects.get(name="Discos").parent, embrague)
+
+    def test_category_import_resolves_batches_larger_than_one_lookup_chunk(self):
+        Category.objects.create(name="Rubro 0005", is_active=True)
+        Category.objects.create(name="Padre 0550", is_active=True)
+        file_obj = build_import_workbook(
+            ["nombre", "padre"],
+            [[f"Rubro {index:04d}", f"Padre {index:04d}"] for index in range(600)],
+        )
+
+        preview = CategoryImporter(file_obj).run(dry_run=True)
+
+        self.assertEqual((preview.errors, preview.updated, preview.created), (0, 1, 599))
+        parent_notes = [row for row in preview.row_results if row.errors]
+        self.assertEqual(len(parent_notes), 599)
+
+    @override_settings(WEBFLEXS_IMPORT_CHUNK_SIZE=2)
+    def test_streamed_chunks_match_read_excel(self):
+        file_obj = build_import_workbook(
+            ["Nombre", "Padre", "Nombre"],
+            [["Frenos", None, "x"], [None, None, None], ["Pastillas", "Frenos", 3], ["Cintas", "Frenos"], [None]],
+        )
+        expected = pd.read_excel(file_obj, engine="openpyxl")
+        expected.columns = [str(c).lower().strip() for c in expected.columns]
+
+        file_obj.seek(0)
+        importer = CategoryImporter(file_obj)
+        importer.load_data()
+
+        self.assertEqual(list(importer.df.index), [0, 1, 2, 3])
+        pd.testing.assert_frame_equal(
+            importer.df.astype(object),
+            expected.astype(object),
+            check_index_type=False,
+        )
+
+    @override_settings(WEBFLEXS_IMPORT_CHUNK_SIZE=2)
+    def test_import_processes_every_chunk(self):
+        file_obj = build_import_workbook(
+            ["SKU", "Nombre", "Precio"],
+            [[f"CHK-{index}", f"Producto {index}", 10] for index in range(5)],
+        )
+
+        result = ProductImporter(file_obj).run(dry_run=False)
+
+        self.assertEqual(result.total_rows, 5)
+        self.assertEqual(result.created, 5)
+        self.assertEqual([row.row_number for row in result.row_results], [2, 3, 4, 5, 6])
+
+    def test_streamed_error_cells_match_read_excel(self):
+        file_obj = build_import_workbook(
+            ["SKU", "Precio", "Stock"],
+            [["ERR-1", "#DIV/0!", 3], ["ERR-2", 10, "#N/A"], ["ERR-3", "#REF!", "#VALUE!"]],
+        )
+        expected = pd.read_excel(file_obj, engine="openpyxl")
+        expected.columns = [str(c).lower().strip() for c in expected.columns]
+
+        file_obj.seek(0)
+        importer = ProductImporter(file_obj)
+        importer.load_data()
+
+        self.assertTrue(pd.isna(importer.df.loc[0, "precio"]))
+        pd.testing.assert_frame_equal(
+            importer.df.astype(object),
+            expected.astype(object),
+            check_index_type=False,
+        )
+
+    def test_streaming_failure_is_reported_as_read_error(self):
+        file_obj = build_import_workbook(["Nombre"], [["Frenos"]])
+
+        with patch.object(ReadOnlyWorksheet, "iter_rows", side_effect=KeyError("xl/worksheets/sheet1.xml")):
+            with self.assertRaisesMessage(ValueError, "Error reading file: "):
+                CategoryImporter(file_obj).run(dry_run=True)
+
+    def test_progress_total_does_not_need_sheet_dimensions(self):
+        file_obj = build_import_workbook(["Nombre"], [["Frenos"], ["Pastillas"], ["Cintas"]])
+        progress = []
+
+        with patch.object(ReadOnlyWorksheet, "max_row", new_callable=PropertyMock, return_value=None):
+            result = CategoryImporter(file_obj).run(dry_run=True, progress_callback=lambda *args: progress.append(args))
+
+        self.assertEqual(result.total_rows, 3)
+        self.assertEqual(progress, [(1, 3), (2, 3), (3, 3)])
+
+    def test_vectorized_slugs_match_django_slugify(self):
+        names = ["Suspensión Trasera", "  Frenos / Discos ", "Ñandú_2--x", "Bujes"]
+        df = pd.DataFrame({"nombre": [*names, 15, None]})
+
+        slugs = CategoryImporter._slugify_names(df)
+
+        self.assertEqual(slugs, {index + 2: slugify(name) for index, name in enumerate(names)})
+
+
+class CategoryAssignmentTests(CatalogTestCase):
+    def setUp(self):
+        self.cat_a = Category.objects.create(name="Asignacion A", is_active=True)
+        self.cat_b = Category.objects.create(name="Asignacion B", is_active=True)
+        self.product_a = Product.objects.create(sku="ASG-1", name="Producto A", price=Decimal("1.00"))
+        self.product_b = Product.objects.create(sku="ASG-2", name="Producto B", price=Decimal("1.00"))
+
+    def test_assign_keeps_preferred_primary_category(self):
+        assign_categories_to_product(self.product_a, [self.cat_a.id, self.cat_b.id], self.cat_b.id)
+
+        self.product_a.refresh_from_db()
+        self.assertEqual(self.product_a.category_id, self.cat_b.id)
+
+    def test_remove_resyncs_primary_to_lowest_remaining_category(self):
+        add_category_to_products([self.product_a.id, self.product_b.id], self.cat_b.id)
+        add_category_to_products([self.product_a.id], self.cat_a.id)
+
+        remove_category_from_products([self.product_a.id, self.product_b.id], self.cat_b.id)
+
+        self.product_a.refresh_from_db()
+        self.product_b.refresh_from_db()
+        self.assertEqual(self.product_a.category_id, self.cat_a.id)
+        self.assertIsNone(self.product_b.category_id)
+
+
+class ClampRequestProductsTests(CatalogTestCase):
+    def test_unique_sku_skips_taken_suffixes_with_one_query(self):
+        for sku in ("ABT3481220S", "ABT3481220S-R1", "ABT3481220S-R2"):
+            Product.objects.create(sku=sku, name=sku, price=Decimal("1.00"))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(_build_unique_sku("ABT3481220S"), "ABT3481220S-R3")
+        self.assertEqual(_build_unique_sku("ABT3481220T"), "ABT3481220T")
+
+    def test_unique_sku_ignores_excluded_product(self):
+        product = Product.objects.create(sku="ABL3470180P", name="Clamp", price=Decimal("1.00"))
+
+        self.assertEqual(_build_unique_sku("ABL3470180P", exclude_product_id=product.pk), "ABL3470180P")
+        self.assertEqual(_build_unique_sku("ABL3470180P"), "ABL3470180P-R1")
+
+    def test_unique_sku_truncates_long_base_before_suffix(self):
+        base = "A" * 50
+        Product.objects.create(sku=base, name="Largo", price=Decimal("1.00"))
+        Product.objects.create(sku="A" * 47 + "-R1", name="Largo R1", price=Decimal("1.00"))
+
+        self.assertEqual(_build_unique_sku(base), "A" * 47 + "-R2")
+
+    def test_abrazaderas_category_prefers_exact_root_name(self):
+        Category.objects.create(name="Abrazaderas especiales", is_active=True, order=1)
+        exact = Category.objects.create(name="Abrazaderas", is_active=True, order=5)
+
+        with self.assertNumQueries(1):
+            category = _ensure_abrazaderas_category()
+
+        self.assertEqual(category.pk, exact.pk)
+
+    def test_abrazaderas_category_falls_back_to_partial_root_name(self):
+        partial = Category.objects.create(name="Abrazaderas especiales", is_active=True, order=1)
+
+        self.assertEqual(_ensure_abrazaderas_category().pk, partial.pk)
+
+    def test_exact_match_loads_clamp_specs_for_sync_without_lookup(self):
+        product = Product.objects.create(sku="ABT3481220S", name="Clamp", price=Decimal("1.00"))
+        ClampSpecs.objects.create(
+            product=product,
+            fabrication="TREFILADA",
+            diameter="3/4",
+            width=81,
+            length=220,
+            shape="SEMICURVA",
+            manual_override=True,
+        )
+        values = {
+            "clamp_type": "trefilada",
+            "diameter": "3/4",
+            "width_mm": 81,
+            "length_mm": 220,
+            "profile_type": "SEMICURVA",
+        }
+
+        match = _find_exact_match_by_values(**values)
+        with self.assertNumQueries(0):
+            specs = _ensure_clamp_specs_values(match, **values)
+
+        self.assertEqual(specs.product_id, product.pk)
+
+
 class ClampMeasureRequestFlowTests(CatalogTestCase):
     def setUp(self):
         self.client_user = User.objects.create_user(username="cliente_medidas", password="secret123")
@@ -1,6 +1,8 @@
 
 import pandas as pd
 import openpyxl
+from pandas.io.parsers import TextParser
+from django.conf import settings
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from decimal import Decimal
@@ -70,6 +72,26 @@ def sanitize_import_value(value):
 def sanitize_import_data(data):
     return sanitize_import_value(data or {})
 
+
+def _excel_cell_value(cell):
+    """Convert an openpyxl cell the same way pd.read_excel does."""
+    value = cell.value
+    if value is None:
+        return ""
+    if cell.data_type == "e":
+        # Error values (#N/A, #DIV/0!, #REF!, ...) are missing data, not text.
+        return math.nan
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _excel_row_values(cells):
+    row = [_excel_cell_value(cell) for cell in cells]
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
 class BaseImporter(ABC):
     """
     Abstract Base Class for Data Importers.
@@ -81,16 +103,98 @@ class BaseImporter(ABC):
         self.results = ImportResult()
         self.df = None
         self.required_columns = []
+        self._expected_rows = 0
+
+    def get_chunk_size(self) -> int:
+        return max(int(getattr(settings, "WEBFLEXS_IMPORT_CHUNK_SIZE", 1000) or 1), 1)
+
+    def prepare_frame(self, df):
+        """Normalize one chunk read from the file. Headers: lowercase, strip."""
+        df.columns = [str(c).lower().strip() for c in df.columns]
+        return df
+
+    def iter_frames(self):
+        """Yields the file as normalized DataFrames of at most get_chunk_size() rows."""
+        for frame in self._read_excel_chunks():
+            yield self.prepare_frame(frame)
 
     def load_data(self):
-        """Loads data from Excel file into Pandas DataFrame."""
+        """Loads the whole Excel file into a single Pandas DataFrame."""
+        frames = list(self.iter_frames())
+        self.df = frames[0] if len(frames) == 1 else pd.concat(frames)
+        return True
+
+    def _read_excel_chunks(self):
+        """
+        Streams the first sheet with openpyxl in read-only mode.
+
+        Cells are converted like pd.read_excel (same header mangling, dtypes
+        and NaN handling, trailing empty rows dropped) and the index keeps the
+        position in the sheet, so memory stays bounded by the chunk size.
+        """
+        try:
+            workbook = openpyxl.load_workbook(self.file, read_only=True, data_only=True, keep_links=False)
+        except Exception as e:
+            raise ValueError(f"Error reading file: {str(e)}")
+
         try:
-            self.df = pd.read_excel(self.file, engine='openpyxl')
-            # Normalize Headers: lowercase, strip
-            self.df.columns = [str(c).lower().strip() for c in self.df.columns]
-            return True
+            sheet = workbook.worksheets[0]
+            self._expected_rows = self._sheet_data_rows(sheet)
+            rows = sheet.iter_rows()
+            header = next(rows, None)
+            if header is None:
+                yield pd.DataFrame()
+                return
+
+            header = _excel_row_values(header)
+            chunk_size = self.get_chunk_size()
+            chunk = []
+            pending_blank_rows = 0
+            start = 0
+            for cells in rows:
+                row = _excel_row_values(cells)
+                if not row:
+                    # Blank rows only count if more data follows them.
+                    pending_blank_rows += 1
+                    continue
+                chunk.extend([] for _ in range(pending_blank_rows))
+                pending_blank_rows = 0
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    yield self._build_frame(header, chunk, start)
+                    start += len(chunk)
+                    chunk = []
+            if chunk or start == 0:
+                yield self._build_frame(header, chunk, start)
         except Exception as e:
+            # Corrupt sheets only fail while streaming; report them like a
+            # file that cannot be opened.
             raise ValueError(f"Error reading file: {str(e)}")
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _sheet_data_rows(sheet):
+        """
+        Data rows announced by the sheet dimensions, only used as a progress
+        estimate: read-only sheets may have no dimensions (max_row None) or
+        stale ones, so 0 means unknown and run() counts the rows it reads.
+        """
+        try:
+            max_row = sheet.max_row
+        except Exception:
+            return 0
+        if not isinstance(max_row, int):
+            return 0
+        return max(max_row - 1, 0)
+
+    @staticmethod
+    def _build_frame(header, rows, start):
+        width = max([len(header), *(len(row) for row in rows)])
+        data = [row + [""] * (width - len(row)) for row in [header, *rows]]
+        frame = TextParser(data, header=0).read()
+        frame.index = range(start, start + len(frame))
+        return frame
 
     def validate_structure(self):
         """Checks if required columns exist."""
@@ -110,45 +214,67 @@ class BaseImporter(ABC):
         """
         pass
 
+    def get_batch_size(self) -> int:
+        return max(int(getattr(settings, "IMPORT_BATCH_SIZE", 500) or 1), 1)
+
+    def prepare_batch(self, rows: List[Dict[str, Any]], dry_run: bool = True) -> None:
+        """Hook called before processing each batch of rows (bulk prefetch)."""
+
+    def flush_batch(self, dry_run: bool = True) -> None:
+        """Hook called after each batch of rows (bulk writes)."""
+
     def run(self, dry_run: bool = True, progress_callback=None) -> ImportResult:
-        """Executes the import process."""
-        self.load_data()
-        self.validate_structure()
-        
-        self.results.total_rows = len(self.df)
-        
-        for index, row in self.df.iterrows():
-            # Report progress
-            if progress_callback:
-                progress_callback(index + 1, self.results.total_rows)
-
-            # row_number 2 because Excel header is 1, and 0-index
-            row_num = index + 2 
-            row_dict = row.to_dict()
-            row_dict["__row_number"] = row_num
+        """Executes the import process, one file chunk at a time."""
+        self.results.total_rows = 0
+        batch_size = self.get_batch_size()
+
+        for chunk_number, frame in enumerate(self.iter_frames()):
+            self.df = frame
+            if chunk_number == 0:
+                self.validate_structure()
+            self.results.total_rows += len(frame)
+            total_rows = max(self.results.total_rows, self._expected_rows)
+
+            for start in range(0, len(frame), batch_size):
+                batch = []
+                for index, row in frame.iloc[start:start + batch_size].iterrows():
+                    # row_number 2 because Excel header is 1, and 0-index
+                    row_dict = row.to_dict()
+                    row_dict["__row_number"] = index + 2
+                    batch.append((index, row_dict))
+
+                self.prepare_batch([row_dict for _index, row_dict in batch], dry_run=dry_run)
+                for index, row_dict in batch:
+                    # Report progress
+                    if progress_callback:
+                        progress_callback(index + 1, total_rows)
+                    self._run_row(row_dict, dry_run=dry_run)
+                self.flush_batch(dry_run=dry_run)
+
+        return self.results
+
+    def _run_row(self, row_dict: Dict[str, Any], dry_run: bool = True) -> None:
+        row_num = row_dict["__row_number"]
+        try:
+            row_result = self.process_row(row_dict, dry_run=dry_run)
+            row_result.row_number = row_num
             
-            try:
-                row_result = self.process_row(row_dict, dry_run=dry_run)
-                row_result.row_number = row_num
-                
-                if row_result.success:
-                    if row_result.action == 'created':
-                        self.results.created += 1
-                    elif row_result.action == 'updated':
-                        self.results.updated += 1
-                else:
-                    self.results.errors += 1
-                    
-                self.results.row_results.append(row_result)
-                
-            except Exception as e:
+            if row_result.success:
+                if row_result.action == 'created':
+                    self.results.created += 1
+                elif row_result.action == 'updated':
+                    self.results.updated += 1
+            else:
                 self.results.errors += 1
-                self.results.row_results.append(ImportRowResult(
-                    row_number=row_num,
-                    data=row_dict,
-                    success=False,
-                    errors=[str(e)],
-                    action="error"
-                ))
                 
-        return self.results
+            self.results.row_results.append(row_result)
+            
+        except Exception as e:
+            self.results.errors += 1
+            self.results.row_results.append(ImportRowResult(
+                row_number=row_num,
+                data=row_dict,
+                success=False,
+                errors=[str(e)],
+                action="error"
+            ))
@@ -501,6 +501,11 @@ IMPORT_MAX_FILE_SIZE_BYTES = max(
     _env_int("IMPORT_MAX_FILE_SIZE_BYTES", 10 * 1024 * 1024),
     1024 * 1024,
 )
+IMPORT_BATCH_SIZE = max(_env_int("IMPORT_BATCH_SIZE", 500), 1)
+# Filas leidas del Excel por tramo (lectura en streaming con openpyxl read_only).
+WEBFLEXS_IMPORT_CHUNK_SIZE = max(_env_int("WEBFLEXS_IMPORT_CHUNK_SIZE", 1000), 1)
+# Procesos (spawn) para parsear descripciones de abrazaderas; un pool por importacion (0/1 = secuencial).
+WEBFLEXS_IMPORT_WORKERS = max(_env_int("WEBFLEXS_IMPORT_WORKERS", 0), 0)
 IMPORT_ALLOWED_CONTENT_TYPES = tuple(
     _env_csv(
         "IMPORT_ALLOWED_CONTENT_TYPES",
@@ -90,3 +90,4 @@ MEDIA_ROOT = _TEST_TEMP_ROOT / "media"
 STATIC_ROOT = _TEST_TEMP_ROOT / "static"
 BACKUP_ROOT = _TEST_TEMP_ROOT / "backups"
 BACKUP_INCLUDE_MEDIA = False
+WEBFLEXS_IMPORT_WORKERS = 0
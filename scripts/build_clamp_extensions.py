@@ -0,0 +1,112 @@
+"""
+Compila opcionalmente los parsers de abrazaderas como extensiones nativas.
+
+Uso (desde la raiz del repo):
+
+    WEBFLEXS_CYTHON=1 python scripts/build_clamp_extensions.py
+
+Genera los .so en build/clamp_ext/ junto con un manifest.json que guarda el
+sha256 de catalog/services/clamp_parser.py y clamp_code.py. Nunca escribe
+junto a los .py, asi que no los tapa. Al importar `catalog`, con
+WEBFLEXS_CYTHON activo, catalog/services/clamp_extensions.py carga cada
+extension solo si su fuente no cambio desde la compilacion.
+
+Hay que volver a correr este script despues de cada cambio en esos dos
+modulos (por ejemplo en el deploy); mientras tanto se usa Python puro y se
+registra una advertencia. Si no hay Cython, compilador o la variable
+WEBFLEXS_CYTHON no esta activa, el script no hace nada.
+"""
+import importlib.machinery
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def _load_clamp_extensions():
+    # Por ruta y no como `catalog.services...`: importar el paquete catalog
+    # cargaria las extensiones que este script esta por sobrescribir.
+    path = BASE_DIR / "catalog" / "services" / "clamp_extensions.py"
+    spec = importlib.util.spec_from_file_location("_webflexs_clamp_extensions", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _remove_inplace_builds():
+    """Borra los .so que dejaban versiones anteriores junto a los .py."""
+    for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+        for path in (BASE_DIR / "catalog" / "services").glob(f"clamp_*{suffix}"):
+            path.unlink()
+            print(f"Eliminado {path.relative_to(BASE_DIR)} (compilacion in place anterior).")
+
+
+def main():
+    clamp_extensions = _load_clamp_extensions()
+    if not clamp_extensions.cython_enabled():
+        print("WEBFLEXS_CYTHON no activo: se mantienen los modulos en Python puro.")
+        return 0
+
+    try:
+        from Cython.Build import cythonize
+        from setuptools import Extension, setup
+    except ImportError:
+        print("Cython/setuptools no disponibles: se mantienen los modulos en Python puro.")
+        return 0
+
+    _remove_inplace_builds()
+    build_dir = clamp_extensions.EXTENSIONS_DIR
+    # Borrar (no sobrescribir) la compilacion previa: un proceso que ya la
+    # tiene cargada conserva su copia y el manifiesto viejo deja de valer.
+    if build_dir.is_dir():
+        for path in build_dir.rglob("*"):
+            if path.is_file():
+                path.unlink()
+    modules = clamp_extensions.CLAMP_MODULES
+    # Hash tomado antes de compilar: si la fuente cambia durante el build,
+    # el loader la ve desactualizada en vez de cargar codigo viejo.
+    digests = {name: clamp_extensions.source_digest(clamp_extensions.source_path(name)) for name in modules}
+
+    os.chdir(BASE_DIR)
+    try:
+        setup(
+            name="webflexs-clamp-extensions",
+            ext_modules=cythonize(
+                [
+                    Extension(name, [str(clamp_extensions.source_path(name).relative_to(BASE_DIR))])
+                    for name in modules
+                ],
+                build_dir=str(Path("build") / "cython"),
+                language_level=3,
+                quiet=True,
+            ),
+            script_args=[
+                "build_ext",
+                "--build-lib", str(build_dir),
+                "--build-temp", str(Path("build") / "temp"),
+            ],
+        )
+    except (SystemExit, Exception) as exc:  # noqa: BLE001 - sin toolchain no es un error fatal
+        print(f"No se pudieron compilar las extensiones ({exc}); se usa Python puro.")
+        return 0
+
+    suffix = importlib.machinery.EXTENSION_SUFFIXES[0]
+    manifest = {}
+    for name in modules:
+        relative_path = name.replace(".", "/") + suffix
+        if not (build_dir / relative_path).is_file():
+            print(f"No se encontro la extension de {name}; se usa Python puro.")
+            return 0
+        manifest[name] = {"path": relative_path, "sha256": digests[name]}
+    (build_dir / clamp_extensions.MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    print(f"Extensiones de abrazaderas compiladas en {build_dir.relative_to(BASE_DIR)}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())